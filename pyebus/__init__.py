@@ -9,6 +9,7 @@ Overview
 * :any:`MsgDef`: Message Definition containing multiple Field Defintions :any:`FieldDef`.
   A Virtual Field Definition :any:`VirtFieldDef` is a calculated value based on other fields.
 * :any:`MsgDefs`: is a container for message definitions (:any:`MsgDef`).
+  :any:`FrozenMsgDefs` is an immutable, shareable snapshot of it.
 * :any:`types`: contains the type engine, which allows the simple decode and
   encode of EBUSD values to/from python values.
 * :any:`DummyConnection` emulates a connection. It answers requests by delegating to :any:`Dummy`.
@@ -29,6 +30,7 @@ __version__ = importlib_metadata.version(__name__)
 from . import types
 from .circuitinfo import CircuitInfo
 from .circuitmap import CircuitMap
+from .condition import Condition
 from .connection import CommandError, Connection, Shutdown
 from .const import AUTO, NA, OK
 from .dummyconnection import DummyConnection
@@ -37,7 +39,7 @@ from .dummyserver import DummyServer
 from .ebus import Ebus
 from .exceptions import UnknownMsgError
 from .icon import get_icon
-from .msg import BrokenMsg, Field, Msg
+from .msg import BrokenMsg, CompactMsg, Field, LazyMsg, Msg
 from .msgdef import FieldDef, MsgDef, VirtFieldDef, resolve_prio
-from .msgdefs import MsgDefs
+from .msgdefs import FrozenMsgDefs, MsgDefs
 from .prioritizer import Prioritizer
@@ -0,0 +1,114 @@
+"""
+Columnar Batch Decoding.
+
+Decode many value strings of the same message definition at once into :any:`numpy` arrays.
+:any:`numpy` is an optional dependency, which is just imported on use (``pip install pyebus[numpy]``).
+"""
+import collections
+import itertools
+
+from .const import NA
+from .types import EnumType, FloatType, IntType
+
+
+class Column(collections.namedtuple("_Column", "fielddef values mask categories")):
+
+    """
+    Decoded Values of one Field.
+
+    Attributes:
+        fielddef (FieldDef): Field Definition.
+        values: Array with one decoded value per value string.
+        mask: Boolean Array, which is `True` for every value string without proper value (missing, `-` or broken).
+        categories (tuple): Enumeration Values, `values` are the indices into them. `None` for other types.
+    """
+
+    __slots__ = tuple()
+
+
+def decode_columns(msgdef, valuestrs):
+    """
+    Decode `valuestrs` of message `msgdef` into one :any:`Column` per field.
+
+    Args:
+        msgdef (MsgDef): Message Definition
+        valuestrs: Value strings, like :any:`MsgDecoder.decode_value` takes them.
+
+    The array type depends on the field type:
+
+    * :any:`IntType`: `int64`, `0` on masked entries.
+    * :any:`IntType` with divider and :any:`FloatType`: `float64`, `NaN` on masked entries.
+    * :any:`EnumType`: `int32` category codes, `-1` on masked entries.
+      Pure integer values of unknown coding are appended to `categories`.
+    * Any other type: `object` with the decoded values, `None` or `NA` on masked entries.
+
+    Every distinct value string of a field is decoded just once by the field type,
+    so the values are identical to the ones of :any:`MsgDecoder`.
+    Virtual fields are not calculated.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+
+    # logs repeat the same value strings a lot, so just distinct ones are split and decoded
+    valuestrs = list(valuestrs)
+    rowindex = {valuestr: rowidx for rowidx, valuestr in enumerate(dict.fromkeys(valuestrs))}
+    rowinverse = numpy.fromiter(map(rowindex.__getitem__, valuestrs), dtype=numpy.intp, count=len(valuestrs))
+    rows = [_split(valuestr) for valuestr in rowindex]
+    fielddefs = [fielddef for fielddef in msgdef.fields if fielddef.idx is not None]
+    # transpose, missing values become `None`
+    numfields = max((fielddef.idx + 1 for fielddef in fielddefs), default=0)
+    columns = list(itertools.islice(itertools.zip_longest(*rows), numfields))
+    missing = (None,) * len(rows)
+    return tuple(
+        _decode_column(numpy, fielddef, columns[fielddef.idx] if fielddef.idx < len(columns) else missing, rowinverse)
+        for fielddef in fielddefs
+    )
+
+
+def _split(valuestr):
+    valuestr = valuestr.strip()
+    if valuestr.startswith("ERR: ") or valuestr in ("no data stored", "nosignal"):
+        return ()
+    return valuestr.split(";")
+
+
+def _decode_column(numpy, fielddef, column, rowinverse):
+    # factorize: decode every distinct string just once and spread the results via `inverse`
+    uniques = list(dict.fromkeys(column))
+    index = {valuestr: uidx for uidx, valuestr in enumerate(uniques)}
+    inverse = numpy.fromiter(map(index.__getitem__, column), dtype=numpy.intp, count=len(column))
+    type_ = fielddef.type_
+    decoded = [NA if valuestr is None else _decode(type_, valuestr) for valuestr in uniques]
+    umask = numpy.array([value is None or value is NA for value in decoded], dtype=bool)
+    categories = None
+    if isinstance(type_, EnumType):
+        categories = list(type_.values)
+        codes = []
+        for value in decoded:
+            if value is None or value is NA:
+                codes.append(-1)
+            else:
+                if value not in categories:
+                    categories.append(value)
+                codes.append(categories.index(value))
+        categories = tuple(categories)
+        uvalues = numpy.array(codes, dtype=numpy.int32)
+    elif isinstance(type_, IntType) and not (type_.divider and type_.divider > 0):
+        uvalues = numpy.array([0 if value is None or value is NA else value for value in decoded], dtype=numpy.int64)
+    elif isinstance(type_, (IntType, FloatType)):
+        uvalues = numpy.array(
+            [numpy.nan if value is None or value is NA else value for value in decoded], dtype=numpy.float64
+        )
+    else:
+        uvalues = numpy.empty(len(decoded), dtype=object)
+        # element-wise, to keep sequences (i.e. of HexType) as they are
+        for uidx, value in enumerate(decoded):
+            uvalues[uidx] = value
+    inverse = inverse[rowinverse]
+    return Column(fielddef, uvalues[inverse], umask[inverse], categories)
+
+
+def _decode(type_, valuestr):
+    try:
+        return type_.decode(valuestr.strip())
+    except ValueError:
+        return None
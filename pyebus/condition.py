@@ -0,0 +1,94 @@
+"""
+Message Definition Conditions.
+
+EBUSD message definitions may just apply to specific software or hardware versions of a device.
+The conditions are prefixed to the message type, i.e. `[SW>=413]r` or `[HW=7603;7604]w`.
+"""
+import collections
+import functools
+import operator
+import re
+
+from .util import repr_
+
+_RE_CONDITION = re.compile(r"\[([^\[\]<>=]+)(<=|>=|<|>|=)?([^\[\]]*)\]")
+_ATTRS = {"SW": "swversion", "HW": "hwversion"}
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+class Condition(collections.namedtuple("_Condition", "name op values")):
+
+    """
+    Condition of a Message Definition.
+
+    Args:
+        name (str): `SW` (software version), `HW` (hardware version) or the name of a condition defined by EBUSD.
+        op (str): Operator `=`, `<`, `<=`, `>` or `>=`. `None` for a named condition.
+        values (tuple): Values to compare with. `=` matches any of them.
+
+    >>> from pyebus import CircuitInfo
+    >>> condition = Condition('SW', '>=', (413,))
+    >>> str(condition)
+    '[SW>=413]'
+    >>> condition.applies(CircuitInfo('bai', 'Vaillant', 'BAI00', '0204', '9602', 8))
+    False
+    >>> condition.applies(CircuitInfo('bai', 'Vaillant', 'BAI00', '0413', '9602', 8))
+    True
+    """
+
+    __slots__ = tuple()
+
+    def __str__(self):
+        values = ";".join(str(value) for value in self.values)
+        return f"[{self.name}{self.op or ''}{values}]"
+
+    def __repr__(self):
+        return repr_(self, (self.name, self.op, self.values))
+
+    def applies(self, circuitinfo):
+        """
+        Return `False` if the device described by :any:`CircuitInfo` `circuitinfo` does not fulfill the condition.
+
+        Conditions, which cannot be evaluated, like named conditions or without `circuitinfo`, apply.
+        """
+        attr = _ATTRS.get(self.name.upper())
+        if circuitinfo is None or attr is None or self.op is None:
+            return True
+        value = _decode_value(getattr(circuitinfo, attr).strip())
+        if self.op == "=":
+            return value in self.values
+        if isinstance(value, int) and isinstance(self.values[0], int):
+            return _OPS[self.op](value, self.values[0])
+        return True
+
+
+@functools.lru_cache(maxsize=128)
+def decode_conditions(type_):
+    """
+    Split Conditions from message type `type_`.
+
+    Returns:
+        tuple: (conditions, type_) with a tuple of :any:`Condition` and the remaining type.
+
+    >>> decode_conditions('[SW>=413]r')
+    ((Condition('SW', '>=', (413,)),), 'r')
+    >>> decode_conditions('[HW=7603;7604][heating]w')
+    ((Condition('HW', '=', (7603, 7604)), Condition('heating', None, ())), 'w')
+    >>> decode_conditions('r5')
+    ((), 'r5')
+    """
+    conditions = []
+    pos = 0
+    while type_.startswith("[", pos):
+        mat = _RE_CONDITION.match(type_, pos)
+        if not mat:
+            raise ValueError(f"Invalid condition {type_[pos:]!r}")
+        name, op_, values = mat.groups()
+        values = tuple(_decode_value(value.strip()) for value in values.split(";")) if op_ else ()
+        conditions.append(Condition(name.strip(), op_, values))
+        pos = mat.end()
+    return tuple(conditions), type_[pos:]
+
+
+def _decode_value(value):
+    return int(value) if value.isdigit() else value
@@ -0,0 +1,312 @@
+"""
+EBUSD Configuration Loader.
+
+EBUSD reads its message definitions from the CSV files of the ebusd-configuration_.
+The :any:`ConfigLoader` reads the same files and creates the message definitions
+without any running EBUSD, like :any:`decode_msgdef` does for the lines of the EBUSD command
+`find -a -F type,circuit,name,fields`.
+
+The CSV files are specified at
+https://github.com/john30/ebusd/wiki/4.1.-Message-definition .
+
+Supported are:
+
+* message definitions with default rows (`*r,...`), which provide a default circuit name.
+* templates from `_templates.csv` of the file directory and all parent directories.
+  Templates of a subdirectory overwrite the ones of the parent directories.
+* includes (`!include,file.inc`).
+* conditions on the software and hardware version (`[SW>=413]r,...`).
+
+.. _ebusd-configuration: https://github.com/john30/ebusd-configuration
+"""
+import collections
+import csv
+import logging
+import mmap
+import pathlib
+import re
+
+from .msgdefdecoder import decode_msgdef
+from .msgdefs import MsgDefs
+
+_LOGGER = logging.getLogger(__name__)
+
+_RE_VERSION = re.compile(r"(SW|HW)(\d+)", re.IGNORECASE)
+_RE_ADDRESS = re.compile(r"[0-9a-fA-F]{2}")
+
+_FileName = collections.namedtuple("_FileName", "address ident circuit swversion hwversion")
+
+
+class ConfigLoader:
+
+    """
+    Loader of Message Definitions from EBUSD Configuration Files.
+
+    Args:
+        path: Directory with the configuration files, i.e. `ebusd-2.1.x/en` of the ebusd-configuration.
+
+    Every file is read via memory-map and the message definitions are decoded once per file and circuit.
+    The results are cached until the file, one of its includes or templates is modified.
+
+    >>> import pathlib
+    >>> from pyebus import CircuitInfo
+    >>> loader = ConfigLoader(pathlib.Path(__file__).parent.parent / "tests" / "testdata" / "config")
+    >>> loader.load_msgdefs().summary()
+    '11 messages (8 read, 1 update, 2 write) with 17 fields'
+    >>> circuitinfo = CircuitInfo("mc.4", "Vaillant", "MC2  ", "0500", "6301", 0x52)
+    >>> for msgdef in loader.load_msgdefs([circuitinfo]):
+    ...     print(msgdef.ident)
+    broadcast/outsidetemp
+    mc.4/Status
+    mc.4/Mode
+    mc.4/currenterror
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self._rows = {}
+        self._msgdefs = {}
+
+    def load_msgdefs(self, circuitinfos=None):
+        """
+        Load Message Definitions.
+
+        Keyword Args:
+            circuitinfos: :any:`CircuitInfo` of the connected devices, i.e. from :any:`decode_circuitinfos`.
+                          `None` loads all files.
+
+        Returns:
+            MsgDefs: Message Definitions
+
+        Files named `ZZ.ID[.CIRCUIT][.SWxxxx][.HWxxxx].csv` belong to the device with the slave address `ZZ`.
+        For every circuit information the most specific file with the same address, an `ID` at the
+        beginning of the model and the same versions is loaded. Files within a subdirectory need to
+        be located within the directory of the manufacturer.
+        The circuit name of the circuit information replaces the one from the file and
+        message definitions, whose conditions are not fulfilled by the device, are skipped.
+        Files without address are loaded always.
+        """
+        msgdefs = MsgDefs()
+        templates = {}
+        for path, circuit, circuitinfo in self._select(circuitinfos):
+            for msgdef in self._load_file(path, circuit, templates):
+                if msgdef.applies(circuitinfo):
+                    msgdefs.add(msgdef)
+        return msgdefs
+
+    def _select(self, circuitinfos):
+        paths = sorted(path for path in self.path.rglob("*.csv") if not path.name.startswith("_"))
+        filenames = [(path, _decode_filename(path.name)) for path in paths]
+        if circuitinfos is None:
+            return [(path, filename.circuit, None) for path, filename in filenames]
+        manufacturers = {circuitinfo.manufacturer.lower() for circuitinfo in circuitinfos}
+        selected = [
+            (path, filename.circuit, None)
+            for path, filename in filenames
+            if filename.address is None and self._get_manufacturer(path) in manufacturers | {None}
+        ]
+        for circuitinfo in circuitinfos:
+            candidates = [
+                (_get_specificity(filename), path)
+                for path, filename in filenames
+                if filename.address is not None
+                and _matches(filename, circuitinfo)
+                and self._get_manufacturer(path) in (circuitinfo.manufacturer.lower(), None)
+            ]
+            if candidates:
+                selected.append((max(candidates)[1], circuitinfo.circuit, circuitinfo))
+            else:
+                _LOGGER.info("No configuration for %s", circuitinfo)
+        return selected
+
+    def _get_manufacturer(self, path):
+        parts = path.relative_to(self.path).parts
+        return parts[0].lower() if len(parts) > 1 else None
+
+    def _load_file(self, path, circuit, templates):
+        key = (path, circuit)
+        entry = self._msgdefs.get(key)
+        if entry is None or any(_get_stamp(deppath) != stamp for deppath, stamp in entry[0].items()):
+            deps = {}
+            lines = self._iter_lines(path, circuit, templates, deps, {}, ())
+            msgdefs = []
+            for line in lines:
+                try:
+                    msgdefs.append(decode_msgdef(line))
+                except ValueError:
+                    _LOGGER.warning("Cannot decode message definition %r in %s", line, path)
+            entry = self._msgdefs[key] = (deps, tuple(msgdefs))
+        return entry[1]
+
+    def _iter_lines(self, path, circuit, templates, deps, defaults, including):
+        # pylint: disable=too-many-arguments
+        # `including` are the resolved paths currently expanded, to stop include cycles
+        including = including + (path.resolve(),)
+        dirtemplates = self._get_templates(path.parent, templates, deps)
+        for row in self._read(path, deps):
+            type_ = row[0]
+            if type_ == "!include":
+                includepath = path.parent / row[1]
+                if includepath.resolve() in including:
+                    _LOGGER.warning("Skipping recursive include of %s in %s", includepath, path)
+                    continue
+                try:
+                    yield from self._iter_lines(includepath, circuit, templates, deps, defaults, including)
+                except OSError as exc:
+                    _LOGGER.warning("Cannot include %s (%s)", includepath, exc)
+            elif type_.startswith("!"):
+                _LOGGER.debug("Ignoring %r in %s", type_, path)
+            elif type_.startswith("*"):
+                defaults[type_[1:]] = row
+            else:
+                yield _create_line(row, circuit, defaults, dirtemplates)
+
+    def _get_templates(self, dirpath, templates, deps):
+        # templates of one directory are resolved once per load
+        entry = templates.get(dirpath)
+        if entry is None:
+            dirdeps = {}
+            if dirpath != self.path and self.path in dirpath.parents:
+                dirtemplates = dict(self._get_templates(dirpath.parent, templates, dirdeps))
+            else:
+                dirtemplates = {}
+            path = dirpath / "_templates.csv"
+            if path.exists():
+                for row in self._read(path, dirdeps):
+                    name, datatype, dividervalues, unit, comment = (row + [""] * 5)[:5]
+                    dirtemplates[name] = _expand_field(name, "", datatype, dividervalues, unit, comment, dirtemplates)
+            else:
+                # an added file invalidates the cache as well
+                dirdeps[path] = None
+            entry = templates[dirpath] = (dirdeps, dirtemplates)
+        deps.update(entry[0])
+        return entry[1]
+
+    def _read(self, path, deps):
+        stamp = deps[path] = _get_stamp(path)
+        entry = self._rows.get(path)
+        if entry is None or entry[0] != stamp:
+            entry = self._rows[path] = (stamp, _read_rows(path))
+        return entry[1]
+
+
+def load_msgdefs(path, circuitinfos=None):
+    """
+    Load Message Definitions from the EBUSD configuration files at `path`.
+
+    See :any:`ConfigLoader.load_msgdefs` for details.
+    """
+    return ConfigLoader(path).load_msgdefs(circuitinfos)
+
+
+def _get_stamp(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_rows(path):
+    with open(path, "rb") as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                text = str(data, "utf-8-sig", errors="replace")
+        except ValueError:
+            # empty files cannot be mapped
+            text = ""
+    lines = (line for line in text.splitlines() if line.strip() and not line.startswith("#"))
+    return [[value.strip() for value in row] for row in csv.reader(lines)]
+
+
+def _decode_filename(name):
+    """
+    Decode Configuration File Name.
+
+    >>> _decode_filename('08.bai.csv')
+    _FileName(address=8, ident='bai', circuit='bai', swversion=None, hwversion=None)
+    >>> _decode_filename('52.mc2.mc.4.SW0500.csv')
+    _FileName(address=82, ident='mc2', circuit='mc.4', swversion='0500', hwversion=None)
+    >>> _decode_filename('broadcast.csv')
+    _FileName(address=None, ident=None, circuit='broadcast', swversion=None, hwversion=None)
+    """
+    parts = name.rpartition(".")[0].split(".")
+    address = None
+    if len(parts) > 1 and _RE_ADDRESS.fullmatch(parts[0]):
+        address = int(parts.pop(0), 16)
+    versions = {}
+    names = []
+    for part in parts:
+        mat = _RE_VERSION.fullmatch(part)
+        if mat:
+            versions[mat.group(1).upper()] = mat.group(2)
+        else:
+            names.append(part)
+    ident = names[0] if address is not None else None
+    if len(names) > 1 and names[-1].isdigit():
+        circuit = f"{names[-2]}.{names[-1]}"
+    else:
+        circuit = names[-1]
+    return _FileName(address, ident, circuit, versions.get("SW"), versions.get("HW"))
+
+
+def _matches(filename, circuitinfo):
+    model = circuitinfo.model.replace(" ", "").lower()
+    return (
+        filename.address == circuitinfo.address
+        and model.startswith(filename.ident.lower())
+        and filename.swversion in (None, circuitinfo.swversion)
+        and filename.hwversion in (None, circuitinfo.hwversion)
+    )
+
+
+def _get_specificity(filename):
+    return (filename.swversion is not None) + (filename.hwversion is not None), len(filename.ident)
+
+
+def _create_line(row, circuit, defaults, templates):
+    """Create a message definition line like `find -a -F type,circuit,name,fields` returns it."""
+    row = row + [""] * (8 - len(row))
+    type_, rowcircuit, name = row[:3]
+    if not rowcircuit:
+        default = defaults.get(type_.rpartition("]")[2]) or defaults.get(type_.rpartition("]")[2][:1])
+        rowcircuit = default[1] if default else ""
+    if not rowcircuit or rowcircuit == circuit.partition(".")[0]:
+        # the circuit of the file or the circuit information, including the instance suffix
+        rowcircuit = circuit
+    fieldvalues = row[8:]
+    while fieldvalues and not fieldvalues[-1]:
+        fieldvalues.pop()
+    values = [type_, rowcircuit, name]
+    for idx in range(0, len(fieldvalues), 6):
+        for field in _expand_field(*(fieldvalues[idx : idx + 6] + [""] * 6)[:6], templates):
+            values.extend(field)
+    return ",".join(_quote(value) for value in values)
+
+
+def _expand_field(name, part, datatype, dividervalues, unit, comment, templates):
+    # pylint: disable=too-many-arguments
+    refs = datatype.split(";")
+    if not all(ref in templates for ref in refs):
+        return [(name, part, datatype, dividervalues, unit, comment)]
+    fields = [field for ref in refs for field in templates[ref]]
+    # the field name and the given attributes overwrite the ones of the template
+    first = fields[0]
+    fields[0] = (
+        name if name and len(fields) == 1 else first[0],
+        part,
+        first[2],
+        dividervalues or first[3],
+        unit or first[4],
+        comment or first[5],
+    )
+    return [fields[0]] + [(field[0], part) + tuple(field[2:]) for field in fields[1:]]
+
+
+def _quote(value):
+    if "," in value or '"' in value:
+        value = value.replace('"', '""')
+        return f'"{value}"'
+    return value
@@ -2,16 +2,17 @@
 import asyncio
 import collections
 import logging
+import time
 
 from .circuitinfodecoder import decode_circuitinfos
 from .connection import CommandError, Connection
 from .const import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_TIMEOUT, OK
 from .exceptions import UnknownMsgError
-from .msg import BrokenMsg, filter_msg
+from .msg import BrokenMsg, MsgFilter, filter_msg
 from .msgdecoder import MsgDecoder
 from .msgdef import resolve_prio
-from .msgdefdecoder import decode_msgdef
-from .msgdefs import MsgDefs
+from .msgdefdecoder import decode_msgdef, decode_msgdefs
+from .msgdefs import FrozenMsgDefs, MsgDefs
 from .util import repr_
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,6 +46,7 @@ class Ebus:
         "scans",
         "msgdefcodes",
         "_msgdecoder",
+        "_loadedmsgdefs",
         "_circuitinfos",
         "_circuitinfomap",
     )
@@ -71,6 +73,7 @@ class Ebus:
         self.scans = scans or self.DEFAULT_SCANS
         self.msgdefcodes = msgdefcodes or []
         self._msgdecoder = MsgDecoder(msgdefs or MsgDefs())
+        self._loadedmsgdefs = None
         self.circuitinfos = circuitinfos or []
         _LOGGER.info(repr(self))
 
@@ -183,7 +186,8 @@ class Ebus:
         """
         Load Message Definitions from EBUSD.
 
-        Alias for :any:`async_load_msgdefcodes` and :any:`decode_msgdefcodes`.
+        Alias for :any:`async_load_circuitinfos`, :any:`async_load_msgdefcodes` and :any:`decode_msgdefcodes`.
+        The circuit information is required to skip message definitions, which do not apply to the device.
 
         Raises:
             ConnectionRefusedError: If connection cannot be established
@@ -191,6 +195,7 @@ class Ebus:
             CommandError: If command failed
             Shutdown: On EBUSD shutdown.
         """
+        await self.async_load_circuitinfos()
         await self.async_load_msgdefcodes()
         self.decode_msgdefcodes()
 
@@ -198,6 +203,9 @@ class Ebus:
         """
         Load EBUS Message Definition Codes from EBUSD and store to :any:`msgdefcodes`.
 
+        Every code is decoded once while it is received, so :any:`decode_msgdefcodes`
+        just needs to take over the already decoded message definitions.
+
         Raises:
             ConnectionRefusedError: If connection cannot be established
             ConnectionError: On connection breakdown.
@@ -207,33 +215,56 @@ class Ebus:
         _LOGGER.info("load_msgdefcodes()")
         if add:
             msgdefcodes = self.msgdefcodes
+            msgdefs = self._get_loadedmsgdefs()
         else:
             msgdefcodes = self.msgdefcodes = []
+            msgdefs = MsgDefs()
+        known = set(msgdefcodes)
         await self.connection.async_request(_CMD_FINDMSGDEFS)
         async for line in self.connection.async_read():
             line = line.strip()
+            if line in known:
+                continue
             try:
                 msgdef = decode_msgdef(line)
             except ValueError as exc:
                 _LOGGER.warning("Cannot decode message definition %r (%s)", line, exc)
             else:
-                if msgdef and not msgdef.circuit.startswith("scan") and line not in msgdefcodes:
+                if msgdef and not msgdef.circuit.startswith("scan"):
+                    known.add(line)
                     msgdefcodes.append(line)
+                    msgdefs.add(msgdef)
+        self._loadedmsgdefs = (tuple(msgdefcodes), msgdefs)
 
     def decode_msgdefcodes(self):
-        """Decode `msgdefcodes` and use as `msgdefs`."""
+        """
+        Decode `msgdefcodes` and use as `msgdefs`.
+
+        Message definitions, whose conditions are not fulfilled by the device in :any:`circuitinfos`, are skipped.
+        """
         _LOGGER.info("decode_msgdefcodes()")
-        # Decode
-        msgdefs = []
-        for msgdefcode in self.msgdefcodes:
-            try:
-                msgdefs.append(decode_msgdef(msgdefcode))
-            except ValueError as exc:
-                _LOGGER.warning("Cannot decode message definition %r (%s)", msgdefcode, exc)
-        # Sort
-        self.msgdefs.clear()
-        for msgdef in sorted(msgdefs, key=lambda msgdef: (msgdef.circuit, msgdef.name)):
-            self.msgdefs.add(msgdef)
+        msgdefs = self._get_loadedmsgdefs()
+        msgdefs.sort()
+        skipped = [msgdef for msgdef in msgdefs if not self._applies(msgdef)]
+        if skipped:
+            # keep the loaded definitions for the next decode
+            msgdefs = msgdefs.thaw()
+            for msgdef in skipped:
+                _LOGGER.debug("Skipping %r", msgdef)
+                msgdefs.discard(msgdef)
+        if isinstance(self.msgdefs, FrozenMsgDefs):
+            self.msgdefs = self.msgdefs.thaw()
+        self.msgdefs.assign(msgdefs)
+
+    def _get_loadedmsgdefs(self):
+        """Return Message Definitions of `msgdefcodes` - decoded ones are taken from the last load."""
+        loaded = self._loadedmsgdefs
+        if loaded is not None and loaded[0] == tuple(self.msgdefcodes):
+            return loaded[1]
+        # a process pool does not fit into the event loop
+        msgdefs = decode_msgdefs(self.msgdefcodes, processes=1)
+        self._loadedmsgdefs = (tuple(self.msgdefcodes), msgdefs)
+        return msgdefs
 
     async def async_read(self, msgdef, ttl=None, setprio=None):
         """
@@ -302,7 +333,7 @@ class Ebus:
         if resp != "done":
             raise CommandError(resp)
 
-    async def async_listen(self, msgdefs=None):
+    async def async_listen(self, msgdefs=None, lazy=False, values_only=False):
         """
         Listen to EBUS for messages.
 
@@ -310,6 +341,9 @@ class Ebus:
 
         Keyword Args:
             msgdefs (MsgDefs): Message definitions to be listened, other messages are ignored.
+            lazy (bool): Yield :any:`LazyMsg` instances, which decode their fields on first access.
+            values_only (bool): Yield `(ident, values, timestamp)` tuples instead of messages.
+                                `values` is `None` for broken messages.
 
         Yields:
             Msg: Messages
@@ -320,11 +354,12 @@ class Ebus:
             CommandError: If command failed
             Shutdown: On EBUSD shutdown.
         """
-        _LOGGER.info("listen(msgdefs=%r)", msgdefs)
-        async for msg in self._async_listen(msgdefs):
-            yield msg
+        _LOGGER.info("listen(msgdefs=%r, lazy=%r, values_only=%r)", msgdefs, lazy, values_only)
+        msgfilter = MsgFilter(msgdefs) if msgdefs is not None else None
+        async for msg in self._async_listen(msgfilter, lazy=lazy, compact=values_only):
+            yield _values_only(msg) if values_only else msg
 
-    async def async_observe(self, msgdefs=None, ttl=None, setprio=None):
+    async def async_observe(self, msgdefs=None, ttl=None, setprio=None, values_only=False):
         """
         Observe `msgdefs` messages.
 
@@ -335,6 +370,8 @@ class Ebus:
             msgdefs (MsgDefs): Message definitions to be observed, other messages are ignored.
             ttl (int): Time-to-live. Maximum age of read value in seconds.
             setprio: Priority `1-9` or `A` for automatic.
+            values_only (bool): Yield `(ident, values, timestamp)` tuples instead of messages.
+                                `values` is `None` for broken messages.
 
         Yields:
             Msg: Message
@@ -345,39 +382,41 @@ class Ebus:
             CommandError: If command failed
             Shutdown: On EBUSD shutdown.
         """
-        _LOGGER.info("observe(msgdefs=%r, ttl=%r, setprio=%r)", msgdefs, ttl, setprio)
+        _LOGGER.info("observe(msgdefs=%r, ttl=%r, setprio=%r, values_only=%r)", msgdefs, ttl, setprio, values_only)
         msgdefs = msgdefs or self.msgdefs
+        msgfilter = MsgFilter(msgdefs)
         data = collections.defaultdict(lambda: None)
 
         # read all
         for msgdef in msgdefs:
+            if not self._applies(msgdef):
+                continue
             if msgdef.read:
                 if setprio:
                     msgdef = msgdef.replace(setprio=resolve_prio(msgdef, setprio))
-                msg = await self._async_read(msgdef, ttl=ttl)
+                msg = await self._async_read(msgdef, ttl=ttl, compact=values_only)
                 _LOGGER.debug("observe-read: %r", msg)
-                msg = filter_msg(msg, msgdefs)
+                msg = filter_msg(msg, msgfilter)
                 if msg:
                     if msg.valid:
                         data[msgdef.ident] = msg
-                    yield msg
+                    yield _values_only(msg) if values_only else msg
             elif msgdef.update:
                 data[msgdef.ident] = None
 
         # find new values (which got updated while we where reading)
         await self.connection.async_request("find -d")
         async for line in self.connection.async_read(check=False):
-            msg = self._decode_msg(line)
+            msg = self._decode_msg(line, compact=values_only, msgfilter=msgfilter)
             _LOGGER.debug("observe-find: %r", msg)
-            msg = filter_msg(msg, msgdefs)
             if msg and msg != data[msg.msgdef.ident]:
-                yield msg
+                yield _values_only(msg) if values_only else msg
                 data[msg.msgdef.ident] = msg
 
         # listen
-        async for msg in self._async_listen(msgdefs):
+        async for msg in self._async_listen(msgfilter, compact=values_only):
             _LOGGER.debug("observe-listen: %r", msg)
-            yield msg
+            yield _values_only(msg) if values_only else msg
 
     async def async_get_state(self):
         """
@@ -465,31 +504,38 @@ class Ebus:
         async for line in self.connection.async_read(infinite=infinite, check=check):
             yield line
 
-    async def _async_read(self, msgdef, ttl=None):
+    async def _async_read(self, msgdef, ttl=None, compact=False):
         try:
             await self.connection.async_request("read", msgdef.name, c=msgdef.circuit, p=msgdef.setprio, m=ttl)
             line = await self.connection.async_readresp(check=False)
         except CommandError as exc:  # pragma: no cover
             return BrokenMsg(msgdef, str(exc))
-        return self._msgdecoder.decode_value(msgdef, line)
+        return self._msgdecoder.decode_value(msgdef, line, compact=compact)
 
-    async def _async_listen(self, msgdefs):
+    async def _async_listen(self, msgfilter, lazy=False, compact=False):
         await self.connection.async_request("listen")
         resp = await self.connection.async_readresp()
         if resp != "listen started":
             raise CommandError(f"Listen could not be started: {resp}")
         async for line in self.connection.async_read(check=False):
-            msg = self._decode_msg(line)
-            msg = filter_msg(msg, msgdefs)
+            msg = self._decode_msg(line, lazy=lazy, compact=compact, msgfilter=msgfilter)
             if msg:
                 yield msg
 
-    def _decode_msg(self, line):
+    def _applies(self, msgdef):
+        return msgdef.applies(self.get_circuitinfo(msgdef.circuit))
+
+    def _decode_msg(self, line, lazy=False, compact=False, msgfilter=None):
         if line:
             try:
-                return self._msgdecoder.decode_line(line)
+                return self._msgdecoder.decode_line(line, lazy=lazy, compact=compact, msgfilter=msgfilter)
             except UnknownMsgError:
                 pass
             except ValueError as exc:  # pragma: no cover
                 _LOGGER.warning("Cannot decode message in %r: %s", line, exc)
         return None
+
+
+def _values_only(msg):
+    # broken messages need to be distinguishable from messages without fields
+    return msg.ident, msg.values if msg.valid else None, time.time()
@@ -1,5 +1,6 @@
 """EBUS Messages And Their Fields."""
 import collections
+import collections.abc
 
 from .const import NA
 from .util import repr_
@@ -61,9 +62,190 @@ class Field(collections.namedtuple("_Field", "fielddef value")):
         return value
 
 
+class LazyMsg(Msg):
+
+    """
+    Message with Fields, which are decoded on first access.
+
+    The fields are :any:`LazyFields`. Apart from that, the message behaves like :any:`Msg`.
+    """
+
+    __slots__ = tuple()
+
+
+class CompactMsg(Msg):
+
+    """
+    Message with Values.
+
+    The fields are :any:`ValueFields`, which just store the values.
+    Apart from that, the message behaves like :any:`Msg`.
+    """
+
+    __slots__ = tuple()
+
+    @property
+    def values(self):
+        """Values."""
+        return self.fields.values
+
+
+class _Fields(collections.abc.Sequence):
+    """Sequence of :any:`Field`, which are created on access."""
+
+    __slots__ = tuple()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[idx] for idx in range(*index.indices(len(self))))
+        return self._get(index)
+
+    def _get(self, index):
+        raise NotImplementedError
+
+    @property
+    def fielddefs(self):
+        """Field Definitions."""
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+class LazyFields(_Fields):
+
+    """
+    Fields, which are decoded on first access.
+
+    Args:
+        valuestr (str): Undecoded value string with semicolon separated values.
+        fieldspecs (tuple): `(fielddef, idx, decode)` tuple for every field.
+        virtfieldspecs (tuple): `(virtfielddef, func)` tuple for every virtual field.
+
+    Decoded fields are cached. Virtual field functions get this sequence and decode just the fields they need.
+
+    >>> from pyebus import FieldDef, types
+    >>> temp = FieldDef(0, 'temp', types.IntType(0, 100))
+    >>> mode = FieldDef(1, 'mode', types.EnumType(('off', 'on')))
+    >>> fields = LazyFields('23;on', ((temp, 0, temp.type_.decode), (mode, 1, mode.type_.decode)), ())
+    >>> fields[1]
+    Field('mode', 'on')
+    >>> fields
+    (Field('temp', 23), Field('mode', 'on'))
+    """
+
+    __slots__ = ("_valuestr", "_values", "_fieldspecs", "_virtfieldspecs", "_fields")
+
+    def __init__(self, valuestr, fieldspecs, virtfieldspecs):
+        self._valuestr = valuestr
+        self._values = None
+        self._fieldspecs = fieldspecs
+        self._virtfieldspecs = virtfieldspecs
+        self._fields = [None] * (len(fieldspecs) + len(virtfieldspecs))
+
+    def __len__(self):
+        return len(self._fields)
+
+    def _get(self, index):
+        field = self._fields[index]
+        if field is None:
+            field = self._fields[index] = self._decode(index % len(self._fields))
+        return field
+
+    @property
+    def fielddefs(self):
+        """Field Definitions - without decoding any field."""
+        return tuple(spec[0] for spec in self._fieldspecs + self._virtfieldspecs)
+
+    def _decode(self, index):
+        fieldspecs = self._fieldspecs
+        if index < len(fieldspecs):
+            fielddef, idx, decode = fieldspecs[index]
+            values = self._values
+            if values is None:
+                values = self._values = self._valuestr.split(";")
+            if idx < len(values):
+                try:
+                    value = decode(values[idx].strip())
+                except ValueError:
+                    value = None
+            else:
+                value = NA
+            return Field(fielddef, value)
+        virtfielddef, func = self._virtfieldspecs[index - len(fieldspecs)]
+        return Field(virtfielddef, func(self))
+
+
+class ValueFields(_Fields):
+
+    """
+    Fields, which just store their values.
+
+    Args:
+        fielddefs (tuple): Field Definitions.
+        values (tuple): One value for every field definition.
+
+    :any:`Field` instances are created on access only.
+
+    >>> from pyebus import FieldDef, types
+    >>> temp = FieldDef(0, 'temp', types.IntType(0, 100))
+    >>> mode = FieldDef(1, 'mode', types.EnumType(('off', 'on')))
+    >>> fields = ValueFields((temp, mode), (23, 'on'))
+    >>> fields[1]
+    Field('mode', 'on')
+    >>> fields.values
+    (23, 'on')
+    """
+
+    __slots__ = ("_fielddefs", "_values")
+
+    def __init__(self, fielddefs, values):
+        self._fielddefs = fielddefs
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def _get(self, index):
+        return Field(self._fielddefs[index], self._values[index])
+
+    def __eq__(self, other):
+        if isinstance(other, ValueFields):
+            return self._values == other._values and self._fielddefs == other._fielddefs
+        return super().__eq__(other)
+
+    __hash__ = _Fields.__hash__
+
+    @property
+    def fielddefs(self):
+        """Field Definitions."""
+        return self._fielddefs[: len(self._values)]
+
+    @property
+    def values(self):
+        """Values."""
+        return tuple(self._values)
+
+
 def filter_msg(msg=None, msgdefs=None):
-    """Strip Down Message according to `msgdefs`."""
+    """
+    Strip Down Message according to `msgdefs`.
+
+    `msgdefs` can be any iterable of message definitions or a :any:`MsgFilter`.
+    Fields of a :any:`LazyMsg`, which are stripped, are not decoded.
+    A :any:`CompactMsg` stays compact.
+    """
     if msg is not None:
+        if isinstance(msgdefs, MsgFilter):
+            return msgdefs.filter_msg(msg)
         ident = msg.msgdef.ident
         if msgdefs is not None:
             for msgdef in msgdefs:
@@ -71,15 +253,97 @@ def filter_msg(msg=None, msgdefs=None):
                     if msg.msgdef == msgdef or not msg.valid:
                         return msg
 
-                    fields = tuple(
-                        Field(field.fielddef, field.value) for field in msg.fields if field.fielddef in msgdef.fields
-                    )
-                    return Msg(msgdef, fields)
+                    return _project(msg, msgdef, _get_projection(msg, msgdef))
         else:
             return msg
     return None
 
 
+class MsgFilter:
+
+    """
+    Compiled Message Filter.
+
+    Args:
+        msgdefs: :any:`MsgDefs` or any iterable of message definitions.
+
+    Same as :any:`filter_msg`, but with one dictionary lookup per message.
+    The field selection is computed once per message definition.
+
+    >>> from pyebus import FieldDef, MsgDef, types
+    >>> msgdef = MsgDef('hc', 'Status', (FieldDef(0, 'temp', types.IntType(0, 100)),
+    ...                                  FieldDef(1, 'mode', types.EnumType(('off', 'on')))))
+    >>> msg = Msg(msgdef, (Field(msgdef.fields[0], 23), Field(msgdef.fields[1], 'on')))
+    >>> msgfilter = MsgFilter([msgdef.replace(children=msgdef.fields[1:])])
+    >>> msgfilter.filter_msg(msg)
+    Msg('hc/Status', (Field('mode', 'on'),))
+    >>> msgfilter.filter_msg(Msg(MsgDef('hc', 'Other', ()), ())) is None
+    True
+    """
+
+    __slots__ = ("_msgdefs", "_projections")
+
+    def __init__(self, msgdefs):
+        self._msgdefs = {}
+        for msgdef in msgdefs:
+            # the first definition wins, like on filter_msg
+            self._msgdefs.setdefault(msgdef.ident, msgdef)
+        self._projections = {}
+
+    def __len__(self):
+        return len(self._msgdefs)
+
+    def __contains__(self, ident):
+        return ident in self._msgdefs
+
+    def get(self, ident):
+        """Return the selected message definition for `ident` or `None`."""
+        return self._msgdefs.get(ident)
+
+    def filter_msg(self, msg):
+        """Strip Down Message `msg` or return `None` if not selected."""
+        if msg is None:
+            return None
+        srcmsgdef = msg.msgdef
+        ident = srcmsgdef.ident
+        msgdef = self._msgdefs.get(ident)
+        if msgdef is None:
+            return None
+        if not msg.valid:
+            return msg
+        # the projection depends on the message definition and the field layout of the decoded message
+        numfields = len(msg.fields)
+        projection = self._projections.get(ident)
+        if projection is None or projection[0] is not srcmsgdef or projection[1] != numfields:
+            idxs = None if srcmsgdef == msgdef else _get_projection(msg, msgdef)
+            projection = self._projections[ident] = (srcmsgdef, numfields, idxs)
+        idxs = projection[2]
+        if idxs is None:
+            return msg
+        return _project(msg, msgdef, idxs)
+
+
+def _get_fielddefs(fields):
+    if isinstance(fields, (ValueFields, LazyFields)):
+        return fields.fielddefs
+    return tuple(field.fielddef for field in fields)
+
+
+def _get_projection(msg, msgdef):
+    keep = msgdef.fields
+    return tuple(idx for idx, fielddef in enumerate(_get_fielddefs(msg.fields)) if fielddef in keep)
+
+
+def _project(msg, msgdef, idxs):
+    fields = msg.fields
+    if isinstance(fields, ValueFields):
+        fielddefs, values = fields.fielddefs, fields.values
+        return CompactMsg(
+            msgdef, ValueFields(tuple(fielddefs[idx] for idx in idxs), tuple(values[idx] for idx in idxs))
+        )
+    return Msg(msgdef, tuple(fields[idx] for idx in idxs))
+
+
 class BrokenMsg:
 
     """
@@ -102,6 +366,11 @@ class BrokenMsg:
     def __repr__(self):
         return repr_(self, (self.msgdef.ident, self.error))
 
+    @property
+    def ident(self):
+        """Identifier."""
+        return self.msgdef.ident
+
     @property
     def values(self):
         """Values."""
@@ -1,9 +1,15 @@
 """EBUS Message Decoding."""
-import re
+import collections
 
 from .const import NA
 from .exceptions import UnknownMsgError
-from .msg import BrokenMsg, Field, Msg
+from .msg import BrokenMsg, CompactMsg, Field, LazyFields, LazyMsg, Msg, ValueFields
+
+_Plan = collections.namedtuple("_Plan", "msgdef fields fielddefs virtfields valuefielddefs nafielddefs")
+_Projection = collections.namedtuple("_Projection", "plan msgdef fields fielddefs napositions nafielddefs")
+
+# Characters of `[A-z0-9]`, the range `A-z` also covers [ \ ] ^ _ and `
+_CIRCUITCHARS = "".join(chr(code) for code in range(ord("A"), ord("z") + 1)) + "0123456789"
 
 
 class MsgDecoder:
@@ -16,67 +22,212 @@ class MsgDecoder:
 
     The message decoder takes a EBUSD data one-line string and creates the corresponding :any:`Msg` instance.
     The decoder needs to know the actual message definitions.
+
+    The field layout of every message definition is compiled once into a decode plan,
+    which is cached for the latest `PLANCACHESIZE` message definitions.
+
+    With a :any:`MsgFilter`, just the selected fields are decoded.
+    Messages, which are not selected, are not decoded at all.
     """
 
-    _re_decode = re.compile(r"([A-z0-9]+(\.[A-z0-9]+)?) ([^\s]*) (= )?(.*)")
+    PLANCACHESIZE = 1024
 
     def __init__(self, msgdefs):
         self.msgdefs = msgdefs
+        self._plans = {}
+        self._projections = {}
+        self._lineplans = {}
+        self._linemsgdefs = None
+        self._linegeneration = None
 
-    def decode_line(self, line):
+    def decode_line(self, line, lazy=False, compact=False, msgfilter=None):
         """
         Decode EBUSD data `line` and return :any:`Msg` instance.
 
+        The line has the format `circuit name = value` or `circuit name value`.
+
+        Keyword Args:
+            lazy (bool): Return :any:`LazyMsg`, which decodes the fields on first access.
+            compact (bool): Return :any:`CompactMsg`, which just stores the values.
+            msgfilter (MsgFilter): Decode the selected fields only, like :any:`filter_msg` strips them.
+                                   `None` is returned for messages, which are not selected.
+
         Raises:
             ValueError: if `line` does not match expected format.
             UnknownMsgError: if `line` is not covered by fields.
         """
-        match = self._re_decode.match(line)
-        if not match:
-            raise ValueError(line)
-        circuit, _, name, _, valuestr = match.groups()
-        msgdef = self.msgdefs.get(circuit, name)
-        if not msgdef:
-            raise UnknownMsgError(f"circuit={circuit}, name={name}")
-        return self.decode_value(msgdef, valuestr.strip())
-
-    def decode_value(self, msgdef, valuestr):
+        try:
+            circuit, name, valuestr = line.split(" ", 2)
+        except ValueError:
+            raise ValueError(line) from None
+        msgdefs = self.msgdefs
+        if self._linemsgdefs is not msgdefs or self._linegeneration != msgdefs.generation:
+            self._lineplans.clear()
+            self._linemsgdefs = msgdefs
+            self._linegeneration = msgdefs.generation
+        # Only validated (circuit, name) pairs are stored
+        plan = self._lineplans.get((circuit, name))
+        if plan is None:
+            if not _is_circuit(circuit) or (name and name.split() != [name]):
+                raise ValueError(line)
+            msgdef = msgdefs.get(circuit, name)
+            if not msgdef:
+                raise UnknownMsgError(f"circuit={circuit}, name={name}")
+            plan = self._lineplans[(circuit, name)] = self._get_plan(msgdef)
+        if valuestr.startswith("= "):
+            valuestr = valuestr[2:]
+        if "\n" in valuestr:
+            valuestr = valuestr.partition("\n")[0]
+        return self._decode(plan, valuestr.strip(), lazy, compact, msgfilter)
+
+    def decode_value(self, msgdef, valuestr, lazy=False, compact=False, msgfilter=None):
         """
         Decode message `msgdef` value pair string `valuestr`.
 
+        Keyword Args:
+            lazy (bool): Return :any:`LazyMsg`, which decodes the fields on first access.
+            compact (bool): Return :any:`CompactMsg`, which just stores the values.
+            msgfilter (MsgFilter): Decode the selected fields only, like :any:`filter_msg` strips them.
+                                   `None` is returned for messages, which are not selected.
 
         Returns:
             Msg: message with proper data.
             BrokenMsg: Undecodable message.
         """
-        if not valuestr.startswith("ERR: "):
-            fields = tuple(self._decodefields(msgdef, valuestr.strip()))
-            return Msg(msgdef, fields)
-
-        return BrokenMsg(msgdef, valuestr[len("ERR: ") :].strip())
-
-    @staticmethod
-    def _decodefields(msgdef, valuestr):
-        if valuestr not in ("no data stored", "nosignal"):
-            values = valuestr.split(";")
-            fields = []
-            for fielddef in msgdef.fields:
-                if fielddef.idx is None:
-                    continue
-                try:
-                    value = values[fielddef.idx].strip()
-                except IndexError:
-                    fieldvalue = NA
-                else:
-                    try:
-                        fieldvalue = fielddef.type_.decode(value)
-                    except ValueError:
-                        fieldvalue = None
-                fields.append(Field(fielddef, fieldvalue))
+        return self._decode(self._get_plan(msgdef), valuestr, lazy, compact, msgfilter)
+
+    def _decode(self, plan, valuestr, lazy, compact, msgfilter):
+        if msgfilter is None:
+            return _decode(plan, valuestr, lazy, compact)
+        msgdef = plan.msgdef
+        selmsgdef = msgfilter.get(msgdef.ident)
+        if selmsgdef is None:
+            return None
+        if selmsgdef is msgdef:
+            return _decode(plan, valuestr, lazy, compact)
+        projection = self._get_projection(plan, selmsgdef)
+        if projection is None:
+            return _decode(plan, valuestr, lazy, compact)
+        return _decodeprojection(projection, valuestr, compact)
+
+    def _get_plan(self, msgdef):
+        plans = self._plans
+        plan = plans.get(msgdef)
+        # equal message definitions may still have different field definition instances
+        if plan is None or plan.msgdef is not msgdef:
+            if len(plans) >= self.PLANCACHESIZE:
+                del plans[next(iter(plans))]
+            plan = plans[msgdef] = _compile_plan(msgdef)
+        return plan
+
+    def _get_projection(self, plan, selmsgdef):
+        projections = self._projections
+        entry = projections.get(selmsgdef)
+        if entry is None or entry[0] is not plan or entry[1] is not selmsgdef:
+            if len(projections) >= self.PLANCACHESIZE:
+                del projections[next(iter(projections))]
+            projection = None if plan.msgdef == selmsgdef else _compile_projection(plan, selmsgdef)
+            entry = projections[selmsgdef] = (plan, selmsgdef, projection)
+        return entry[2]
+
+
+def _decode(plan, valuestr, lazy=False, compact=False):
+    if not valuestr.startswith("ERR: "):
+        valuestr = valuestr.strip()
+        if lazy and valuestr not in ("no data stored", "nosignal"):
+            return LazyMsg(plan.msgdef, LazyFields(valuestr, plan.fields, plan.virtfields))
+        fielddefs, values = _decodevalues(plan, valuestr)
+        if compact:
+            return CompactMsg(plan.msgdef, ValueFields(fielddefs, values))
+        return Msg(plan.msgdef, tuple(map(Field, fielddefs, values)))
+
+    return BrokenMsg(plan.msgdef, valuestr[len("ERR: ") :].strip())
+
+
+def _decodeprojection(projection, valuestr, compact=False):
+    # the selected fields are decoded right away, so there is nothing left for lazy decoding
+    if valuestr.startswith("ERR: "):
+        return _decode(projection.plan, valuestr)
+    fielddefs, values = _decodeselected(projection, valuestr.strip())
+    if compact:
+        return CompactMsg(projection.msgdef, ValueFields(fielddefs, values))
+    return Msg(projection.msgdef, tuple(map(Field, fielddefs, values)))
+
+
+def _decodeselected(projection, valuestr):
+    if valuestr in ("no data stored", "nosignal"):
+        # nothing to decode
+        _, values = _decodevalues(projection.plan, valuestr)
+        return projection.nafielddefs, tuple(values[pos] for pos in projection.napositions)
+    strs = valuestr.split(";")
+    num = len(strs)
+    values = []
+    append = values.append
+    for idx, decode in projection.fields:
+        if idx < num:
+            try:
+                value = decode(strs[idx].strip())
+            except ValueError:
+                value = None
         else:
-            fields = [Field(fielddef, NA) for fielddef in msgdef.fields]
-        # virtual fields
-        for virtfielddef in msgdef.virtfields:
-            virtfieldvalue = virtfielddef.func(fields)
-            fields.append(Field(virtfielddef, virtfieldvalue))
-        return fields
+            value = NA
+        append(value)
+    return projection.fielddefs, tuple(values)
+
+
+def _decodevalues(plan, valuestr):
+    if valuestr not in ("no data stored", "nosignal"):
+        strs = valuestr.split(";")
+        num = len(strs)
+        values = []
+        append = values.append
+        for _, idx, decode in plan.fields:
+            if idx < num:
+                try:
+                    value = decode(strs[idx].strip())
+                except ValueError:
+                    value = None
+            else:
+                value = NA
+            append(value)
+        fielddefs = plan.valuefielddefs
+    else:
+        values = [NA] * len(plan.fielddefs)
+        fielddefs = plan.nafielddefs
+    # virtual fields see all fields before them
+    if plan.virtfields:
+        fields = ValueFields(fielddefs, values)
+        for _, func in plan.virtfields:
+            values.append(func(fields))
+    return fielddefs, tuple(values)
+
+
+def _compile_plan(msgdef):
+    fielddefs = msgdef.fields
+    fields = tuple(
+        (fielddef, fielddef.idx, fielddef.type_.decode) for fielddef in fielddefs if fielddef.idx is not None
+    )
+    virtfielddefs = msgdef.virtfields
+    virtfields = tuple((virtfielddef, virtfielddef.func) for virtfielddef in virtfielddefs)
+    valuefielddefs = tuple(fielddef for fielddef, _, _ in fields) + virtfielddefs
+    return _Plan(msgdef, fields, fielddefs, virtfields, valuefielddefs, fielddefs + virtfielddefs)
+
+
+def _compile_projection(plan, selmsgdef):
+    # like `filter_msg`, stripped messages keep their selected fields only, no virtual fields
+    keep = selmsgdef.fields
+    fields = tuple((fielddef, idx, decode) for fielddef, idx, decode in plan.fields if fielddef in keep)
+    napositions = tuple(pos for pos, fielddef in enumerate(plan.nafielddefs) if fielddef in keep)
+    return _Projection(
+        plan,
+        selmsgdef,
+        tuple((idx, decode) for _, idx, decode in fields),
+        tuple(fielddef for fielddef, _, _ in fields),
+        napositions,
+        tuple(plan.nafielddefs[pos] for pos in napositions),
+    )
+
+
+def _is_circuit(circuit):
+    head, dot, tail = circuit.partition(".")
+    return bool(head) and not head.strip(_CIRCUITCHARS) and (not dot or (bool(tail) and not tail.strip(_CIRCUITCHARS)))
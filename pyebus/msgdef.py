@@ -2,15 +2,13 @@
 import collections
 import copy
 
-from anytree import NodeMixin
-
 from .const import AUTO
 from .util import repr_
 
 _MsgDef = collections.namedtuple("_MsgDef", "circuit name read prio write update setprio")
 
 
-class MsgDef(_MsgDef, NodeMixin):
+class MsgDef(_MsgDef):
 
     """
     Message Definition.
@@ -28,6 +26,7 @@ class MsgDef(_MsgDef, NodeMixin):
         write (bool): Message intend to be written
         updated (bool): Message intent to be seen automatically on every value change
         setprio: Message polling priority to be set. Integer `1-9 or `A` for automatic.
+        conditions (tuple): :any:`Condition` instances, which all need to be fulfilled by the device.
 
     >>> from pyebus import MsgDef, types
     >>> m = MsgDef('circuit', 'name', [
@@ -50,12 +49,17 @@ class MsgDef(_MsgDef, NodeMixin):
 
     :any:`MsgDef`, :any:`FieldDef` and :any:`VirtFieldDef` form a tree structure
 
-    >>> from anytree import RenderTree
-    >>> print(RenderTree(m))  # doctest: +ELLIPSIS
-    MsgDef('circuit', 'name', (FieldDef(0, 'temp', IntType(-127, 128)),..., StrType())), read=True)
-    ├── FieldDef(0, 'temp', IntType(-127, 128))
-    ├── FieldDef(1, 'name', StrType(length=10))
-    └── VirtFieldDef('virt', StrType())
+    >>> m.children[0].parent is m
+    True
+    >>> m.children[2].msgdef is m
+    True
+
+    Messages with conditions just apply to specific devices:
+
+    >>> from pyebus import CircuitInfo, Condition
+    >>> c = MsgDef('bai', 'name', [], read=True, conditions=[Condition('SW', '>=', (413,))])
+    >>> c.applies(CircuitInfo('bai', 'Vaillant', 'BAI00', '0204', '9602', 8))
+    False
 
     Similar object can be easily created by:
 
@@ -63,14 +67,22 @@ class MsgDef(_MsgDef, NodeMixin):
     MsgDef('circuit', 'name', (FieldDef(1, 'name', StrType(length=10)),), read=True)
     """
 
-    __slots__ = tuple()
+    children = tuple()
+    conditions = tuple()
 
-    def __new__(cls, circuit, name, children, read=False, prio=None, write=False, update=False, setprio=None):
+    def __new__(
+        cls, circuit, name, children, read=False, prio=None, write=False, update=False, setprio=None, conditions=()
+    ):
+        # pylint: disable=too-many-arguments
         if not read:
             prio = None
         msgdef = _MsgDef.__new__(cls, circuit, name, read, prio, write, update, setprio)
-        if children:
-            msgdef.children = children
+        children = tuple(children) if children else ()
+        for child in children:
+            child.attach(msgdef)
+        msgdef.children = children
+        if conditions:
+            msgdef.conditions = tuple(conditions)
         return msgdef
 
     def __repr__(self):
@@ -81,13 +93,29 @@ class MsgDef(_MsgDef, NodeMixin):
             ("write", self.write, False),
             ("update", self.update, False),
             ("setprio", self.setprio, None),
+            ("conditions", self.conditions, ()),
         ]
         return repr_(self, args, kwargs)
 
     def __hash__(self):
-        return hash(
-            (self.circuit, self.name, self.children, self.read, self.prio, self.write, self.update, self.setprio)
-        )
+        # children are fixed after creation, so the hash is computed just once
+        try:
+            return self.__dict__["_hash"]
+        except KeyError:
+            hash_ = self.__dict__["_hash"] = hash(
+                (
+                    self.circuit,
+                    self.name,
+                    self.children,
+                    self.read,
+                    self.prio,
+                    self.write,
+                    self.update,
+                    self.setprio,
+                    self.conditions,
+                )
+            )
+            return hash_
 
     def __eq__(self, other):
         if self.__class__ is other.__class__:
@@ -100,6 +128,7 @@ class MsgDef(_MsgDef, NodeMixin):
                 self.write,
                 self.update,
                 self.setprio,
+                self.conditions,
             ) == (
                 other.circuit,
                 other.name,
@@ -109,10 +138,27 @@ class MsgDef(_MsgDef, NodeMixin):
                 other.write,
                 other.update,
                 other.setprio,
+                other.conditions,
             )
 
         return NotImplemented
 
+    def __reduce__(self):
+        return (
+            MsgDef,
+            (
+                self.circuit,
+                self.name,
+                self.children,
+                self.read,
+                self.prio,
+                self.write,
+                self.update,
+                self.setprio,
+                self.conditions,
+            ),
+        )
+
     @property
     def fields(self):
         """Fields."""
@@ -126,7 +172,11 @@ class MsgDef(_MsgDef, NodeMixin):
     @property
     def ident(self):
         """Identifier."""
-        return f"{self.circuit}/{self.name}"
+        try:
+            return self.__dict__["_ident"]
+        except KeyError:
+            ident = self.__dict__["_ident"] = f"{self.circuit}/{self.name}"
+            return ident
 
     @property
     def access(self):
@@ -138,9 +188,18 @@ class MsgDef(_MsgDef, NodeMixin):
         prio = str(self.prio) if self.prio else "-"
         return "".join((read, write, update, setprio, prio))
 
+    def applies(self, circuitinfo):
+        """Return `False` if a condition is not fulfilled by the device described by `circuitinfo`."""
+        return all(condition.applies(circuitinfo) for condition in self.conditions)
+
     def join(self, msgdef):
         """Return Joined Message Definition."""
-        if (self.circuit, self.name, self.children) == (msgdef.circuit, msgdef.name, msgdef.children):
+        if (self.circuit, self.name, self.children, self.conditions) == (
+            msgdef.circuit,
+            msgdef.name,
+            msgdef.children,
+            msgdef.conditions,
+        ):
             return self.replace(
                 read=self.read or msgdef.read,
                 prio=self.prio or msgdef.prio,
@@ -155,6 +214,7 @@ class MsgDef(_MsgDef, NodeMixin):
         """Create copy with updated attributes."""
         attrs = self._asdict()
         attrs["children"] = self.children
+        attrs["conditions"] = self.conditions
         attrs.update(kwargs)
         # Take a copy of all children, to ensure proper tree relation
         attrs["children"] = tuple(copy.copy(fielddef) for fielddef in attrs["children"])
@@ -164,7 +224,7 @@ class MsgDef(_MsgDef, NodeMixin):
 _FieldDef = collections.namedtuple("_FieldDef", "idx name type_ unit comment")
 
 
-class AbstractFieldDef(_FieldDef, NodeMixin):
+class AbstractFieldDef(_FieldDef):
 
     """
     Abstract Field Definition.
@@ -179,7 +239,7 @@ class AbstractFieldDef(_FieldDef, NodeMixin):
         comment (str): Comment.
     """
 
-    __slots__ = tuple()
+    parent = None
 
     def __new__(cls, idx, name, type_, unit=None, comment=None):
         return _FieldDef.__new__(cls, idx, name, type_, unit or None, comment or None)
@@ -192,9 +252,15 @@ class AbstractFieldDef(_FieldDef, NodeMixin):
         ]
         return repr_(self, args, kwargs)
 
-    def _pre_detach(self, parent):
-        # it is forbidden to remove fields from their message - create new one
-        assert False, f"{self!r} is already used by {parent!r}"  # pragma: no cover
+    def __reduce__(self):
+        # the parent is restored by the message definition
+        return (self.__class__, tuple(self))
+
+    def attach(self, msgdef):
+        """Attach to message definition `msgdef`."""
+        # it is forbidden to move fields to another message - create new one
+        assert self.parent is None, f"{self!r} is already used by {self.parent!r}"
+        self.parent = msgdef
 
     @property
     def msgdef(self):
@@ -248,6 +314,10 @@ class VirtFieldDef(AbstractFieldDef):
     def __repr__(self):
         return repr_(self, (self.name, self.type_))
 
+    def __reduce__(self):
+        # pylint: disable=E1101
+        return (VirtFieldDef, (self.name, self.type_, self.func, self.unit, self.comment))
+
     def __copy__(self):
         # pylint: disable=E1101
         return VirtFieldDef(name=self.name, type_=self.type_, func=self.func, unit=self.unit, comment=self.comment)
@@ -5,15 +5,31 @@ EBUS message definitions are specified at
 https://github.com/john30/ebusd/wiki/4.1.-Message-definition#message-definition .
 
 The function :any:`decode_msgdef` converts a EBUS message defintion string into a :any:`MsgDef`.
+The function :any:`decode_msgdefs` converts many of them at once into :any:`MsgDefs`.
 """
 import collections
+import concurrent.futures
+import functools
+import logging
+import os
 import re
+import sys
 
+from .condition import decode_conditions
 from .msgdef import FieldDef, MsgDef
-from .typedecoder import decode_type
+from .msgdefs import MsgDefs
+from .typedecoder import decode_type, intern_type
 from .types import EnumType
 from .virtfielddef import iter_virtfielddefs
 
+_LOGGER = logging.getLogger(__name__)
+
+# Inputs with less lines are decoded in-process, as starting the workers takes longer
+PARALLELMIN = 20000
+
+_RE_SPLIT = re.compile(r'"(([^"]|"")+)"(,|$)|([^\,]*)(,|$)')
+_RE_TYPE = re.compile(r"(r)([1-9]?)")
+
 
 def decode_msgdef(line):
     """
@@ -30,12 +46,54 @@ def decode_msgdef(line):
     >>> m.children
     (FieldDef(0, 'temp', IntType(0, 254), unit='°C', comment='text, text'),)
 
+    >>> m = decode_msgdef('[SW>=413]r,bai,APCLegioProtection,,s,UCH,,,Legionellenschutz')
+    >>> m.circuit, m.name, m.read, m.prio, m.write, m.update, m.conditions
+    ('bai', 'APCLegioProtection', True, None, False, False, (Condition('SW', '>=', (413,)),))
+
     >>> m = decode_msgdef('w,ui,TempIncrease,temp,m,D2C,,°C,Temperatur')
     >>> m.circuit, m.name, m.read, m.prio, m.write, m.update
     ('ui', 'TempIncrease', False, None, True, False)
     >>> m.children
     (FieldDef(0, 'temp', IntType(-2047.9, 2047.9, divider=16), unit='°C', comment='Temperatur'),)
     """
+    return _create_msgdef(*_decode(line))
+
+
+def decode_msgdefs(lines, processes=None):
+    """
+    Decode many Message Definitions at once.
+
+    Args:
+        lines: Message definition strings, like :any:`decode_msgdef` takes them.
+
+    Keyword Args:
+        processes (int): Number of worker processes. `None` uses the number of CPUs.
+
+    Returns:
+        MsgDefs: Message Definitions in the order of `lines`.
+
+    Inputs with at least `PARALLELMIN` lines are split into chunks, which are decoded by a process pool.
+    Smaller inputs are decoded in-process. Invalid lines are skipped with a warning.
+
+    >>> msgdefs = decode_msgdefs(['r,mc.4,OtShutdownLimit,temp,s,UCH,,°C,', 'w,ui,TempIncrease,temp,m,D2C,,°C,', 'foo'])
+    >>> msgdefs.summary()
+    '2 messages (1 read, 0 update, 1 write) with 2 fields'
+    """
+    lines = list(lines)
+    processes = processes or os.cpu_count() or 1
+    msgdefs = MsgDefs()
+    if processes > 1 and len(lines) >= PARALLELMIN:
+        chunksize = -(-len(lines) // (processes * 4))
+        chunks = [lines[idx : idx + chunksize] for idx in range(0, len(lines), chunksize)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            for chunk, results in zip(chunks, executor.map(_decode_chunk, chunks)):
+                _add_msgdefs(msgdefs, chunk, results)
+    else:
+        _add_msgdefs(msgdefs, lines, _decode_chunk(lines))
+    return msgdefs
+
+
+def _decode(line):
     try:
         values = _split(line)
         # Workaround for definitions of internal messages like
@@ -43,19 +101,54 @@ def decode_msgdef(line):
         if len(values) == 4 and values[3] == "":
             values = values[:3]
         type_, circuit, name = values[:3]  # pylint: disable=W0632
+        conditions, type_ = decode_conditions(type_)
         read, prio, write, update = decodetype(type_)
         children = _decodefields(values[3:])
     except ValueError:
         raise ValueError(f"Invalid message definition {line!r}") from None
+    return sys.intern(circuit), sys.intern(name), children, read, prio, write, update, conditions
+
+
+def _decode_chunk(lines):
+    # Runs in the worker process. Virtual fields cannot be pickled, so just the plain arguments are returned.
+    results = []
+    for line in lines:
+        try:
+            results.append(_decode(line))
+        except ValueError as exc:
+            results.append(str(exc))
+    return results
+
+
+def _add_msgdefs(msgdefs, lines, results):
+    for line, result in zip(lines, results):
+        if isinstance(result, str):
+            _LOGGER.warning("Cannot decode message definition %r (%s)", line, result)
+        else:
+            msgdefs.add(_create_msgdef(*result))
+
+
+def _create_msgdef(circuit, name, children, read, prio, write, update, conditions):
+    # pylint: disable=too-many-arguments
+    children = list(children)
+    for idx, child in enumerate(children):
+        # types decoded by a worker process are unpickled copies
+        type_ = intern_type(child.type_)
+        if type_ is not child.type_:
+            children[idx] = child._replace(type_=type_)
     for child in iter_virtfielddefs(children):
         children.append(child)
-    return MsgDef(circuit, name, tuple(children), read, prio, write, update)
+    return MsgDef(
+        sys.intern(circuit), sys.intern(name), tuple(children), read, prio, write, update, conditions=conditions
+    )
 
 
 def _split(line):
+    if '"' not in line:
+        # same result as the regular expression, as long as there is no quoting
+        return line.split(",")
     values = []
-    regex = re.compile(r'"(([^"]|"")+)"(,|$)|([^\,]*)(,|$)')
-    for mat in regex.finditer(line):
+    for mat in _RE_SPLIT.finditer(line):
         groups = mat.groups()
         values.append(groups[0].replace('""', '"') if groups[0] else groups[3])
         # we don't want the empty match at the end of line if we already
@@ -65,6 +158,7 @@ def _split(line):
     return values
 
 
+@functools.lru_cache(maxsize=128)
 def decodetype(type_):
     """
     Decode Type.
@@ -76,8 +170,7 @@ def decodetype(type_):
     >>> decodetype('u')
     (False, None, False, True)
     """
-    reg = re.compile(r"(r)([1-9]?)")
-    mat = reg.match(type_)
+    mat = _RE_TYPE.match(type_)
     if mat:
         read = mat.group(1) is not None
         prio = int(mat.group(2)) if mat.group(2) else None
@@ -90,46 +183,48 @@ def decodetype(type_):
 
 def _decodefields(values):
     if len(values) % 6 in (0, 3, 4, 5):
-        chunks = _chunks(values, 6)
-        return list(_createfields(chunks))
+        return _createfields(_chunks(values, 6))
 
     raise ValueError()
 
 
 def _createfields(chunks):
-    if chunks:
-        # determine duplicate names
-        fields = []
-        dups = collections.defaultdict(lambda: -1)
-        for chunk in chunks:
-            name, _, datatype = chunk[:3]
-            if not datatype.startswith("IGN"):
-                fields.append(chunk)
-                dups[name] += 1
-        # create fields
-        cnts = collections.defaultdict(lambda: 0)
-        for idx, field in enumerate(fields):
-            name = field[0]
-            if dups[name]:
-                cnt = cnts[name]
-                cnts[name] = cnt + 1
-                name = f"{name}.{cnt}"
-            yield _createfield(idx, name, *field)
+    fields = [chunk for chunk in chunks if not chunk[2].startswith("IGN")]
+    names = [field[0] for field in fields]
+    if len(set(names)) != len(names):
+        # number duplicate names
+        dups = collections.Counter(names)
+        cnts = collections.Counter()
+        for idx, name in enumerate(names):
+            if dups[name] > 1:
+                names[idx] = f"{name}.{cnts[name]}"
+                cnts[name] += 1
+    return [_createfield(idx, name, *field) for idx, (name, field) in enumerate(zip(names, fields))]
 
 
 def _createfield(idx, name, _, __, datatype, dividervalues=None, unit=None, comment=None):
+    type_ = _get_fieldtype(datatype, dividervalues or None)
+    return FieldDef(idx, _intern(name), type_, _intern(unit), _intern(comment))
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_fieldtype(datatype, dividervalues):
+    # the same data types with the same dividers and values are used by many fields
     if dividervalues and "=" in dividervalues:
-        type_ = EnumType(tuple(pair.split("=", 1)[1] for pair in dividervalues.split(";")))
+        return intern_type(EnumType(tuple(sys.intern(pair.split("=", 1)[1]) for pair in dividervalues.split(";"))))
+    ebustype = datatype.split(",")[0]
+    if dividervalues:
+        divider = float(dividervalues)
+        if divider < 0:
+            divider = 1 / -divider
     else:
-        ebustype = datatype.split(",")[0]
-        if dividervalues:
-            divider = float(dividervalues)
-            if divider < 0:
-                divider = 1 / -divider
-        else:
-            divider = None
-        type_ = decode_type(ebustype, divider)
-    return FieldDef(idx, name, type_, unit, comment)
+        divider = None
+    return decode_type(ebustype, divider)
+
+
+def _intern(value):
+    # units, comments and names are repeated across many messages
+    return sys.intern(value) if value else value
 
 
 def _chunks(list_or_tuple, maxsize):
@@ -1,12 +1,15 @@
 """Message Defintions."""
+import bisect
 import collections
+import functools
 import re
-from fnmatch import fnmatch
+from fnmatch import fnmatch, fnmatchcase
 
 from .const import AUTO
 from .msgdef import resolve_prio
 
 _RE_RESOLVE = re.compile(r"\A([^/#+]+)/([^/#+]+)(#(\d|A))?(/([^/#]*))?\Z")
+_WILDCARDS = "*?["
 
 
 class Pattern(collections.namedtuple("Pattern", "circuit name setprio fieldname")):
@@ -14,6 +17,7 @@ class Pattern(collections.namedtuple("Pattern", "circuit name setprio fieldname"
     """Message Definition and Field Definition Search Pattern."""
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def from_str(pattern):
         """Create :any:`Pattern` from `pattern` string."""
         mat = _RE_RESOLVE.fullmatch(pattern)
@@ -24,6 +28,109 @@ class Pattern(collections.namedtuple("Pattern", "circuit name setprio fieldname"
         raise ValueError(f"Invalid pattern {pattern!r}")
 
 
+class Counts(collections.namedtuple("Counts", "messages fields read update write")):
+
+    """Number of messages, fields and readable, updated and writable messages."""
+
+    __slots__ = tuple()
+
+    def __str__(self):
+        return (
+            f"{self.messages} messages ({self.read} read, {self.update} update, {self.write} write) "
+            f"with {self.fields} fields"
+        )
+
+
+_NOCOUNTS = Counts(0, 0, 0, 0, 0)
+
+
+def _get_counts(msgdef):
+    return (1, len(msgdef.children), int(bool(msgdef.read)), int(bool(msgdef.update)), int(bool(msgdef.write)))
+
+
+class _Index:
+
+    """
+    Case-insensitive Index of Keys.
+
+    Exact keys are looked up via dictionary, patterns with a fixed prefix by bisecting the sorted keys.
+    Matching keys are returned in insertion order.
+
+    >>> index = _Index()
+    >>> for key in ('mc', 'hc', 'mc.3', 'Bai', 'MC'):
+    ...     index.add(key)
+    >>> index.find('mc')
+    ['mc', 'MC']
+    >>> index.find('MC*')
+    ['mc', 'mc.3', 'MC']
+    >>> index.find('*c')
+    ['mc', 'hc', 'MC']
+    >>> index.find('bai')
+    ['Bai']
+    """
+
+    __slots__ = ("_keys", "_sorted", "_order", "_counter")
+
+    def __init__(self):
+        self._keys = {}
+        self._sorted = []
+        self._order = {}
+        # increases on every add, as the number of keys repeats after discard
+        self._counter = 0
+
+    def add(self, key):
+        """Add `key`."""
+        if key not in self._order:
+            self._order[key] = self._counter
+            self._counter += 1
+            lkey = key.lower()
+            keys = self._keys.get(lkey)
+            if keys is None:
+                self._keys[lkey] = [key]
+                bisect.insort(self._sorted, lkey)
+            else:
+                keys.append(key)
+
+    def discard(self, key):
+        """Remove `key` if present."""
+        if self._order.pop(key, None) is not None:
+            lkey = key.lower()
+            keys = self._keys[lkey]
+            keys.remove(key)
+            if not keys:
+                del self._keys[lkey]
+                del self._sorted[bisect.bisect_left(self._sorted, lkey)]
+
+    def find(self, pattern):
+        """Return keys matching `pattern`, wildcards and placeholder are accepted."""
+        pattern = pattern.lower()
+        pos = min((pattern.find(char) for char in _WILDCARDS if char in pattern), default=None)
+        if pos is None:
+            return list(self._keys.get(pattern, ()))
+        prefix = pattern[:pos]
+        sorted_ = self._sorted
+        matches = []
+        for idx in range(bisect.bisect_left(sorted_, prefix), len(sorted_)):
+            lkey = sorted_[idx]
+            if not lkey.startswith(prefix):
+                break
+            if fnmatchcase(lkey, pattern):
+                matches.extend(self._keys[lkey])
+        if len(matches) > 1:
+            matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def copy(self):
+        """Return Copy."""
+        # pylint: disable=protected-access
+        index = _Index()
+        index._keys = {lkey: list(keys) for lkey, keys in self._keys.items()}
+        index._sorted = list(self._sorted)
+        index._order = dict(self._order)
+        index._counter = self._counter
+        return index
+
+
 class MsgDefs:
 
     """
@@ -49,25 +156,222 @@ class MsgDefs:
     [MsgDef('mc', 'Status0a', (FieldDef(0, 'temp', ...'°C'), FieldDef(1, 'mixer', ..., unit='°C')), read=True)]
     >>> msgdefs.summary()
     '2 messages (2 read, 0 update, 0 write) with 7 fields'
+    >>> msgdefs.counts('hc')
+    Counts(messages=1, fields=2, read=1, update=0, write=0)
+    >>> msgdefs.get_ident('hc/Status0')
+    MsgDef('hc', 'Status0', (FieldDef(0, 'temp', Type(), unit='°C'), FieldDef(1, 'temp0', ...)), read=True)
+    >>> msgdefs.get_field_ident('hc/Status0/temp0')
+    FieldDef(1, 'temp0', Type(), unit='°C')
+
+    Results of :any:`resolve` are cached until the next modification.
+
+    :any:`freeze` returns an immutable and hashable snapshot, :any:`thaw` a modifiable copy.
+    Both share the stored definitions with their origin until one of them is modified (copy-on-write).
+
+    >>> frozen = msgdefs.freeze()
+    >>> frozen.add(MsgDef('hc', 'Status1', (FieldDef(0, 'temp', Type(), '°C'),), read=True))
+    Traceback (most recent call last):
+      ...
+    TypeError: FrozenMsgDefs is immutable
+    >>> builder = frozen.thaw()
+    >>> builder.add(MsgDef('hc', 'Status1', (FieldDef(0, 'temp', Type(), '°C'),), read=True))
+    >>> len(frozen), len(builder), len(msgdefs)
+    (2, 3, 2)
     """
 
+    # pylint: disable=R0902,W0201,W0212
+
+    RESOLVECACHESIZE = 128
+
+    _STATE = (
+        "_msgdefs",
+        "_circuitindex",
+        "_nameindex",
+        "_counts",
+        "_circuitcounts",
+        "_members",
+        "_idents",
+        "_fieldidents",
+    )
+
     def __init__(self):
+        self._generation = 0
+        self._resolvecache = collections.OrderedDict()
+        self._shared = False
         self.clear()
 
+    @property
+    def generation(self):
+        """Modification Counter, incremented on every change of the stored definitions."""
+        return self._generation
+
+    def _modified(self):
+        self._generation += 1
+        self._resolvecache.clear()
+        if self._shared:
+            self._unshare()
+
+    def _share(self, other):
+        """Share stored definitions with `other` until the next modification."""
+        for attr in self._STATE:
+            setattr(self, attr, getattr(other, attr))
+        self._generation = other._generation
+        self._shared = other._shared = True
+
+    def _unshare(self):
+        self._shared = False
+        msgdefs = collections.defaultdict(lambda: collections.defaultdict(list))
+        for circuit, circuitmsgdefs in self._msgdefs.items():
+            msgdefs[circuit].update((name, list(namemsgdefs)) for name, namemsgdefs in circuitmsgdefs.items())
+        self._msgdefs = msgdefs
+        self._circuitindex = self._circuitindex.copy()
+        self._nameindex = collections.defaultdict(
+            _Index, ((circuit, index.copy()) for circuit, index in self._nameindex.items())
+        )
+        self._counts = list(self._counts)
+        self._circuitcounts = {circuit: list(counts) for circuit, counts in self._circuitcounts.items()}
+        self._members = set(self._members)
+        self._idents = dict(self._idents)
+        self._fieldidents = dict(self._fieldidents)
+
+    @staticmethod
+    def _from_iter(msgdefs):
+        result = MsgDefs()
+        for msgdef in msgdefs:
+            result.add(msgdef)
+        return result
+
+    def freeze(self):
+        """
+        Return immutable snapshot.
+
+        Returns:
+            FrozenMsgDefs: Frozen Message Definitions
+        """
+        return FrozenMsgDefs(self)
+
+    def thaw(self):
+        """
+        Return modifiable copy.
+
+        Returns:
+            MsgDefs: Message Definitions
+        """
+        msgdefs = MsgDefs()
+        msgdefs._share(self)
+        return msgdefs
+
+    def __copy__(self):
+        return self.thaw()
+
     def clear(self):
         """Remove All Stored Message Definitions."""
+        self._shared = False
+        self._modified()
         self._msgdefs = collections.defaultdict(lambda: collections.defaultdict(list))
+        self._circuitindex = _Index()
+        self._nameindex = collections.defaultdict(_Index)
+        self._counts = [0] * len(Counts._fields)
+        self._circuitcounts = {}
+        self._members = set()
+        self._idents = {}
+        self._fieldidents = {}
+
+    def sort(self):
+        """Sort Stored Message Definitions by circuit and name."""
+        self._modified()
+        msgdefs = collections.defaultdict(lambda: collections.defaultdict(list))
+        circuitindex = _Index()
+        nameindex = collections.defaultdict(_Index)
+        for circuit in sorted(self._msgdefs):
+            circuitmsgdefs = self._msgdefs[circuit]
+            circuitindex.add(circuit)
+            for name in sorted(circuitmsgdefs):
+                msgdefs[circuit][name] = circuitmsgdefs[name]
+                nameindex[circuit].add(name)
+        self._msgdefs = msgdefs
+        self._circuitindex = circuitindex
+        self._nameindex = nameindex
+
+    def assign(self, msgdefs):
+        """
+        Replace All Stored Message Definitions by the ones of `msgdefs`.
+
+        Both share the stored definitions until one of them is modified (copy-on-write).
+        """
+        self._modified()
+        generation = self._generation
+        self._share(msgdefs)
+        self._generation = generation
+
+    def _count(self, msgdef, sign):
+        counts = _get_counts(msgdef)
+        for idx, cnt in enumerate(counts):
+            self._counts[idx] += sign * cnt
+        circuitcounts = self._circuitcounts.setdefault(msgdef.circuit, [0] * len(Counts._fields))
+        for idx, cnt in enumerate(counts):
+            circuitcounts[idx] += sign * cnt
+        if sign > 0:
+            self._members.add(msgdef)
+        else:
+            self._members.discard(msgdef)
+            if not circuitcounts[0]:
+                del self._circuitcounts[msgdef.circuit]
 
     def add(self, msgdef):
         """Add Message Definition."""
-        msgdefs = self._msgdefs[msgdef.circuit][msgdef.name]
+        self._modified()
+        circuit, name = msgdef.circuit, msgdef.name
+        self._circuitindex.add(circuit)
+        self._nameindex[circuit].add(name)
+        msgdefs = self._msgdefs[circuit][name]
         for idx, msgdef0 in enumerate(msgdefs):
             joined = msgdef0.join(msgdef)
             if joined is not None:
                 msgdefs[idx] = joined
+                self._count(msgdef0, -1)
+                self._count(joined, 1)
+                if idx == 0:
+                    self._index_idents(circuit, name)
                 break
         else:
             msgdefs.append(msgdef)
+            self._count(msgdef, 1)
+            if len(msgdefs) == 1:
+                self._index_idents(circuit, name)
+
+    def _index_idents(self, circuit, name):
+        """Index message and field identifier of the first message definition with `circuit` and `name`."""
+        ident = f"{circuit}/{name}"
+        fieldidents = self._fieldidents
+        msgdef = self._idents.pop(ident, None)
+        if msgdef is not None:
+            for fielddef in msgdef.children:
+                fieldidents.pop(f"{ident}/{fielddef.name}", None)
+        circuitmsgdefs = self._msgdefs.get(circuit, None)
+        msgdefs = circuitmsgdefs.get(name, None) if circuitmsgdefs else None
+        if msgdefs:
+            msgdef = self._idents[ident] = msgdefs[0]
+            for fielddef in msgdef.children:
+                fieldidents.setdefault(f"{ident}/{fielddef.name}", fielddef)
+
+    def discard(self, msgdef):
+        """Remove Message Definition, if present."""
+        if msgdef in self._members:
+            self._modified()
+            circuit, name = msgdef.circuit, msgdef.name
+            circuitmsgdefs = self._msgdefs[circuit]
+            msgdefs = circuitmsgdefs[name]
+            msgdefs.remove(msgdef)
+            self._count(msgdef, -1)
+            if not msgdefs:
+                del circuitmsgdefs[name]
+                self._nameindex[circuit].discard(name)
+                if not circuitmsgdefs:
+                    del self._msgdefs[circuit]
+                    del self._nameindex[circuit]
+                    self._circuitindex.discard(circuit)
+            self._index_idents(circuit, name)
 
     def get(self, circuit, name):
         """
@@ -90,8 +394,35 @@ class MsgDefs:
         Returns
             MsgDef: Message Definition
         """
-        pat = Pattern.from_str(ident)
-        return self.get(pat.circuit, pat.name)
+        try:
+            return self._idents[ident]
+        except KeyError:
+            pat = Pattern.from_str(ident)
+            return self.get(pat.circuit, pat.name)
+
+    def get_field(self, circuit, name, fieldname):
+        """
+        Get field `fieldname` of message with `circuit` and `name`.
+
+        Returns
+            FieldDef: Field Definition
+        """
+        return self._fieldidents.get(f"{circuit}/{name}/{fieldname}", None)
+
+    def get_field_ident(self, ident):
+        """
+        Get field with `ident` (i.e. 'ui/OutsideTemp/temp').
+
+        Returns
+            FieldDef: Field Definition
+        """
+        try:
+            return self._fieldidents[ident]
+        except KeyError:
+            pat = Pattern.from_str(ident)
+            if pat.fieldname is None:
+                raise ValueError(f"Invalid field identifier {ident!r}") from None
+            return self.get_field(pat.circuit, pat.name, pat.fieldname)
 
     def find(self, circuit, name="*"):
         """
@@ -101,11 +432,11 @@ class MsgDefs:
             MsgDefs: Message Definitions
         """
         msgdefs = MsgDefs()
-        circuit = circuit.lower()
-        name = name.lower()
-        for msgdef in self:
-            if fnmatch(msgdef.circuit.lower(), circuit) and fnmatch(msgdef.name.lower(), name):
-                msgdefs.add(msgdef)
+        for circuit_ in self._circuitindex.find(circuit):
+            circuitmsgdefs = self._msgdefs[circuit_]
+            for name_ in self._nameindex[circuit_].find(name):
+                for msgdef in circuitmsgdefs[name_]:
+                    msgdefs.add(msgdef)
         return msgdefs
 
     def resolve(self, patterns, filter_=None):
@@ -117,13 +448,31 @@ class MsgDefs:
         """
         if isinstance(patterns, str):
             patterns = patterns.split(";")
+        patterns = tuple(pattern.strip() for pattern in patterns)
         msgdefs = MsgDefs()
-        for pattern in patterns:
-            for msgdef in self._resolve(pattern.strip()):
-                if msgdef not in msgdefs and (filter_ is None or filter_(msgdef)):
-                    msgdefs.add(msgdef)
+        for msgdef in self._resolve_cached(patterns):
+            if filter_ is None or filter_(msgdef):
+                msgdefs.add(msgdef)
         return msgdefs
 
+    def _resolve_cached(self, patterns):
+        # pop and re-insert, to be safe on concurrent use of frozen instances
+        cache = self._resolvecache
+        resolved = cache.pop(patterns, None)
+        if resolved is None:
+            resolved = []
+            seen = set()
+            for pattern in patterns:
+                for msgdef in self._resolve(pattern):
+                    if msgdef not in seen:
+                        seen.add(msgdef)
+                        resolved.append(msgdef)
+            resolved = tuple(resolved)
+        cache[patterns] = resolved
+        if len(cache) > self.RESOLVECACHESIZE:
+            cache.popitem(last=False)
+        return resolved
+
     def _resolve(self, pattern):
         pat = Pattern.from_str(pattern)
         circuit, name, setprio, fieldname = pat
@@ -144,26 +493,40 @@ class MsgDefs:
 
     def set_defaultprio(self, defaultprio):
         """Set Priorities of all messages without a priority value."""
+        self._modified()
         msgdefs = self._msgdefs
         for circuitmsgdefs in msgdefs.values():
             for msgdefs in circuitmsgdefs.values():
                 for idx, msgdef in enumerate(msgdefs):
                     if msgdef.setprio is None:
                         msgdefs[idx] = msgdef.replace(setprio=resolve_prio(msgdef, msgdef.setprio or defaultprio))
+                        self._members.discard(msgdef)
+                        self._members.add(msgdefs[idx])
+                        if idx == 0:
+                            self._index_idents(msgdef.circuit, msgdef.name)
+
+    def counts(self, circuit=None):
+        """
+        Counts of all messages or just the messages of `circuit`.
 
-    def summary(self):
+        Returns:
+            Counts: Counts.
+        """
+        if circuit is None:
+            return Counts(*self._counts)
+        try:
+            return Counts(*self._circuitcounts[circuit])
+        except KeyError:
+            return _NOCOUNTS
+
+    def summary(self, circuit=None):
         """
-        Summary.
+        Summary of all messages or just the messages of `circuit`.
 
         Returns:
             str: Summary.
         """
-        total = len(self)
-        fields = sum(len(msgdef.children) for msgdef in self)
-        read = sum(1 for msgdef in self if msgdef.read)
-        update = sum(1 for msgdef in self if msgdef.update)
-        write = sum(1 for msgdef in self if msgdef.write)
-        return f"{total} messages ({read} read, {update} update, {write} write) with {fields} fields"
+        return str(self.counts(circuit))
 
     def __iter__(self):
         for circuitmsgdefs in self._msgdefs.values():
@@ -171,28 +534,121 @@ class MsgDefs:
                 yield from msgdefs
 
     def __len__(self):
-        return sum(
-            sum(len(msgdefs) for msgdefs in circuitmsgdefs.values()) for circuitmsgdefs in self._msgdefs.values()
-        )
+        return self._counts[0]
+
+    def __contains__(self, msgdef):
+        return msgdef in self._members
+
+    def __eq__(self, other):
+        if isinstance(other, MsgDefs):
+            return self._members == other._members
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def _result(self, msgdefs):
+        return msgdefs
+
+    def issubset(self, other):
+        """Return `True` if all message definitions are contained in `other`."""
+        return len(self) <= len(other) and all(msgdef in other for msgdef in self._members)
+
+    def difference_update(self, other):
+        """Remove all message definitions contained in `other`."""
+        for msgdef in [msgdef for msgdef in self if msgdef in other]:
+            self.discard(msgdef)
 
     def __add__(self, other):
-        if self.__class__ is other.__class__:
+        if isinstance(other, MsgDefs):
             msgdefs = MsgDefs()
             for msgdef in self:
                 msgdefs.add(msgdef)
             for msgdef in other:
                 msgdefs.add(msgdef)
-            return msgdefs
+            return self._result(msgdefs)
 
         return NotImplemented
 
+    __or__ = __add__
+
     def __sub__(self, other):
-        if self.__class__ is other.__class__:
+        if isinstance(other, MsgDefs):
+            msgdefs = MsgDefs()
+            for msgdef in self:
+                if msgdef not in other:
+                    msgdefs.add(msgdef)
+            return self._result(msgdefs)
+
+        return NotImplemented
+
+    def __and__(self, other):
+        if isinstance(other, MsgDefs):
             msgdefs = MsgDefs()
-            othermsgs = tuple(other)
             for msgdef in self:
-                if msgdef not in othermsgs:
+                if msgdef in other:
                     msgdefs.add(msgdef)
-            return msgdefs
+            return self._result(msgdefs)
 
         return NotImplemented
+
+
+class FrozenMsgDefs(MsgDefs):
+
+    """
+    Immutable and Hashable Message Definitions Container.
+
+    Args:
+        msgdefs: :any:`MsgDefs` or iterable with :any:`MsgDef` instances.
+
+    The indexes are shared with `msgdefs`, so creating a snapshot is cheap.
+    All methods, which modify the container, raise a :any:`TypeError`.
+    Use :any:`thaw` to get a modifiable copy.
+    """
+
+    def __init__(self, msgdefs=()):  # pylint: disable=W0231
+        if not isinstance(msgdefs, MsgDefs):
+            msgdefs = MsgDefs._from_iter(msgdefs)
+        self._generation = 0
+        self._resolvecache = collections.OrderedDict()
+        self._shared = False
+        self._hash = None
+        self._share(msgdefs)
+
+    def _modified(self):
+        raise TypeError(f"{self.__class__.__name__} is immutable")
+
+    def add(self, msgdef):
+        self._modified()
+
+    def discard(self, msgdef):
+        self._modified()
+
+    def clear(self):
+        self._modified()
+
+    def set_defaultprio(self, defaultprio):
+        self._modified()
+
+    def sort(self):
+        self._modified()
+
+    def assign(self, msgdefs):
+        self._modified()
+
+    def difference_update(self, other):
+        self._modified()
+
+    def freeze(self):
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._members))
+        return self._hash
+
+    def _result(self, msgdefs):
+        return msgdefs.freeze()
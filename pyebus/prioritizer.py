@@ -1,13 +1,30 @@
 """Message Prioritizer."""
-import collections
+import array
+import json
 import logging
-from datetime import datetime, timedelta
+import os
+import pathlib
+import tempfile
+import time
+import zlib
+from datetime import timedelta
 
 from .exceptions import UnknownMsgError
 from .msgdef import resolve_prio
 
 _LOGGER = logging.getLogger(__name__)
 
+# priority of messages without learned or set priority
+_NOPRIO = -1
+
+_STATEVERSION = 1
+
+
+class _Digest(int):
+    """Checksum of the last values of a message, restored from a state file."""
+
+    __slots__ = tuple()
+
 
 class Prioritizer:
 
@@ -22,22 +39,55 @@ class Prioritizer:
         thresholds: Iterable with seconds or :any:`timedelta` between priority levels.
     Keyword Args:
         intervals: Number of intervals the message update rate need to deviate in a row to get a new prio.
+        statefile: File to keep the learned state across restarts. It is loaded, if it exists,
+                   and saved every `saveinterval` on :any:`notify`.
+        saveinterval: Seconds or :any:`timedelta` between two saves of `statefile`.
+
+    Every message identifier gets an integer slot into arrays with the timestamps (:any:`time.monotonic`),
+    priorities and filter counters. Message identifiers are checked against `msgdefs` once per modification.
     """
 
-    # pylint: disable=R0902
-    def __init__(self, msgdefs, thresholds, intervals=3):
+    # pylint: disable=R0902,W0201
+    def __init__(self, msgdefs, thresholds, intervals=3, statefile=None, saveinterval=600):
+        # pylint: disable=too-many-arguments
         self._msgdefs = msgdefs
         self._thresholds = tuple(_cast_threshold(threshold) for threshold in thresholds)
+        self._limits = tuple(threshold.total_seconds() for threshold in self._thresholds)
         self.intervals = intervals
+        self.statefile = pathlib.Path(statefile) if statefile else None
+        self.saveinterval = _cast_threshold(saveinterval)
         self.clear()
+        self._nextsave = time.monotonic() + self.saveinterval.total_seconds()
+        if self.statefile and self.statefile.exists():
+            try:
+                self.load()
+            except (OSError, ValueError) as exc:
+                _LOGGER.warning("Cannot load prioritizer state from %s (%s)", self.statefile, exc)
 
     def clear(self):
         """Clear."""
-        self._msgtimestamps = {}
-        self._msgprios = {}
-        self._upfilter = collections.defaultdict(lambda: 0)
-        self._dnfilter = collections.defaultdict(lambda: 0)
+        self._slots = {}
+        self._idents = []
+        self._values = []
+        self._timestamps = array.array("d")
+        self._prios = array.array("b")
+        self._upfilter = array.array("L")
+        self._dnfilter = array.array("L")
         self._msgpriochanges = {}
+        self._known = {}
+        self._knowngeneration = None
+
+    def _get_slot(self, ident):
+        slot = self._slots.get(ident)
+        if slot is None:
+            slot = self._slots[ident] = len(self._idents)
+            self._idents.append(ident)
+            self._values.append(None)
+            self._timestamps.append(0.0)
+            self._prios.append(_NOPRIO)
+            self._upfilter.append(0)
+            self._dnfilter.append(0)
+        return slot
 
     @property
     def thresholds(self):
@@ -56,20 +106,23 @@ class Prioritizer:
     def set_prio(self, msgdef, prio):
         """Set Message Priority."""
         if msgdef.read:
-            self._msgprios[msgdef.ident] = max(min(prio, self.maxprio), 0)
-            self._clear_filter(msgdef.ident)
+            slot = self._get_slot(msgdef.ident)
+            self._prios[slot] = max(min(prio, self.maxprio), 0)
+            self._upfilter[slot] = 0
+            self._dnfilter[slot] = 0
 
     def get_prio(self, msgdef):
         """Get Message Priority."""
         if msgdef.read:
-            return self._get_prio(msgdef)
+            return self._get_prio(msgdef, self._slots.get(msgdef.ident))
         return None
 
-    def _get_prio(self, msgdef):
-        try:
-            return self._msgprios[msgdef.ident]
-        except KeyError:
-            return resolve_prio(msgdef)
+    def _get_prio(self, msgdef, slot):
+        if slot is not None:
+            prio = self._prios[slot]
+            if prio != _NOPRIO:
+                return prio
+        return resolve_prio(msgdef)
 
     def iter_priochanges(self):
         """
@@ -90,62 +143,188 @@ class Prioritizer:
             UnknownMsgError
         """
         msgdef = msg.msgdef
-        if not self._msgdefs.get_ident(msgdef.ident):
-            raise UnknownMsgError(f"circuit={msgdef.circuit}, name={msgdef.name}")
+        ident = msgdef.ident
+        slot = self._known.get(ident) if self._knowngeneration == self._msgdefs.generation else None
+        if slot is None:
+            slot = self._get_known(msgdef)
         if msg.valid and msgdef.read:
-            msgtimestamps = self._msgtimestamps
-            ident = msg.ident
-            values = tuple(field.value for field in msg.fields)
-            timestamp = datetime.now()
-            if ident not in msgtimestamps:
+            values = msg.values
+            timestamp = time.monotonic()
+            lastvalues = self._values[slot]
+            if lastvalues is None:
                 # unknown, store first entry
-                msgtimestamps[ident] = (timestamp, values)
-                prio = msgdef.setprio or msgdef.prio or self._get_prio(msg.msgdef)
-                self._msgprios[ident] = prio
+                self._values[slot] = values
+                self._timestamps[slot] = timestamp
+                prio = self._prios[slot] = msgdef.setprio or msgdef.prio or self._get_prio(msgdef, slot)
                 _LOGGER.debug("Init   %s, prio=%d", ident, prio)
             else:
-                (lasttimestamp, lastvalues) = msgtimestamps[ident]
-                age = timestamp - lasttimestamp
-                prio = self._get_prio(msg.msgdef)
+                age = timestamp - self._timestamps[slot]
+                prio = self._prios[slot]
+                limits = self._limits
+                if lastvalues.__class__ is _Digest and lastvalues == _get_digest(values):
+                    # same values as before the restart
+                    lastvalues = self._values[slot] = values
                 is_const = values == lastvalues
-                older = prio < self.maxprio and age > self._thresholds[prio - 1]
-                newer = prio > 1 and age < self._thresholds[min(prio, self.maxprio) - 2]
-                _LOGGER.debug(
-                    "Notify %s: age=%r prio=%r is_const=%r older=%r newer=%r", ident, age, prio, is_const, older, newer
-                )
+                older = prio <= len(limits) and age > limits[prio - 1]
+                newer = prio > 1 and age < limits[min(prio, len(limits) + 1) - 2]
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug(
+                        "Notify %s: age=%r prio=%r is_const=%r older=%r newer=%r",
+                        ident,
+                        age,
+                        prio,
+                        is_const,
+                        older,
+                        newer,
+                    )
                 # check for increment
                 #   - reset filter, if not const
                 #   - increment, if constant value is older than actual threshold for number of intervals
                 if not is_const or older:
-                    if self._filter(self._upfilter, ident, is_const or older):
+                    if self._filter(self._upfilter, slot, is_const or older):
                         _LOGGER.debug("Inc!   %s", ident)
-                        self._set_prio(ident, prio + 1)
-                    msgtimestamps[ident] = (timestamp, values)
+                        self._set_prio(slot, prio + 1)
+                    self._values[slot] = values
+                    self._timestamps[slot] = timestamp
                 # check for decrement
                 #   - reset filter, if constant value
-                if self._filter(self._dnfilter, ident, not is_const and newer):
+                if self._filter(self._dnfilter, slot, not is_const and newer):
                     _LOGGER.debug("Dec!   %s", ident)
-                    self._set_prio(ident, prio - 1)
+                    self._set_prio(slot, prio - 1)
+            if self.statefile and timestamp >= self._nextsave:
+                self._autosave(timestamp)
+
+    def _get_known(self, msgdef):
+        """Return slot of `msgdef` - message identifiers are checked once per modification of the definitions."""
+        msgdefs = self._msgdefs
+        if self._knowngeneration != msgdefs.generation:
+            self._known.clear()
+            self._knowngeneration = msgdefs.generation
+        ident = msgdef.ident
+        slot = self._known.get(ident)
+        if slot is None:
+            if not msgdefs.get_ident(ident):
+                raise UnknownMsgError(f"circuit={msgdef.circuit}, name={msgdef.name}")
+            slot = self._known[ident] = self._get_slot(ident)
+        return slot
 
-    def _set_prio(self, ident, prio):
-        self._msgprios[ident] = prio
+    def _set_prio(self, slot, prio):
+        self._prios[slot] = prio
+        ident = self._idents[slot]
         msgdef = self._msgdefs.get_ident(ident)
         self._msgpriochanges[ident] = msgdef.replace(setprio=prio)
 
-    def _clear_filter(self, ident):
-        self._upfilter[ident] = 0
-        self._dnfilter[ident] = 0
-
-    def _filter(self, cnts, ident, cond):
-        cnt = cnts[ident]
+    def _filter(self, cnts, slot, cond):
+        cnt = cnts[slot]
         if cond and cnt < self.intervals:
             cnt += 1
             cond = False
         else:
             cnt = 0
-        cnts[ident] = cnt
+        cnts[slot] = cnt
         return cond
 
+    def save(self, statefile=None):
+        """
+        Save learned priorities, timestamps and filter counters to `statefile`.
+
+        The file is replaced atomically. `statefile` defaults to the one given on construction.
+        Timestamps are stored as wall-clock time, so they remain valid after a restart.
+
+        Raises:
+            ValueError: without any `statefile`.
+        """
+        statefile = self._get_statefile(statefile)
+        now, wallnow = time.monotonic(), time.time()
+        msgs = {}
+        for slot, ident in enumerate(self._idents):
+            values = self._values[slot]
+            prio = self._prios[slot]
+            if values is None and prio == _NOPRIO:
+                continue
+            if values is None:
+                timestamp = digest = None
+            else:
+                timestamp = round(wallnow - (now - self._timestamps[slot]), 3)
+                digest = values if values.__class__ is _Digest else _get_digest(values)
+            msgs[ident] = [prio, timestamp, digest, self._upfilter[slot], self._dnfilter[slot]]
+        state = {"version": _STATEVERSION, "messages": msgs}
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=statefile.parent, prefix=f".{statefile.name}.", suffix=".tmp", delete=False
+        ) as file:
+            try:
+                json.dump(state, file, separators=(",", ":"))
+                file.flush()
+                os.fsync(file.fileno())
+            except BaseException:
+                file.close()
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, statefile)
+
+    def load(self, statefile=None):
+        """
+        Load learned priorities, timestamps and filter counters from `statefile`.
+
+        `statefile` defaults to the one given on construction.
+        Priorities beyond :any:`maxprio` are limited.
+
+        Raises:
+            ValueError: on invalid file content or without any `statefile`. Nothing is loaded then.
+        """
+        statefile = self._get_statefile(statefile)
+        state = json.loads(statefile.read_text(encoding="utf-8"))
+        if not isinstance(state, dict) or state.get("version") != _STATEVERSION:
+            raise ValueError(f"Unsupported prioritizer state in {statefile}")
+        messages = state.get("messages")
+        if not isinstance(messages, dict):
+            raise ValueError(f"Invalid prioritizer state in {statefile} (no messages)")
+        now, wallnow = time.monotonic(), time.time()
+        # the whole file is validated, before the state is touched
+        entries = []
+        try:
+            for ident, (prio, timestamp, digest, upcnt, dncnt) in messages.items():
+                if prio < 1 and prio != _NOPRIO:
+                    raise ValueError(f"invalid priority {prio} of {ident}")
+                if prio != _NOPRIO:
+                    prio = min(prio, self.maxprio)
+                if timestamp is not None:
+                    timestamp = now - (wallnow - timestamp)
+                    digest = _Digest(digest)
+                entries.append((ident, prio, timestamp, digest, upcnt, dncnt))
+            # the array types check the value ranges
+            array.array("b", [entry[1] for entry in entries])
+            array.array("d", [entry[2] for entry in entries if entry[2] is not None])
+            array.array("L", [cnt for entry in entries for cnt in entry[4:]])
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise ValueError(f"Invalid prioritizer state in {statefile} ({exc})") from None
+        for ident, prio, timestamp, digest, upcnt, dncnt in entries:
+            slot = self._get_slot(ident)
+            self._prios[slot] = prio
+            if timestamp is not None:
+                self._timestamps[slot] = timestamp
+                self._values[slot] = digest
+            self._upfilter[slot] = upcnt
+            self._dnfilter[slot] = dncnt
+
+    def _get_statefile(self, statefile):
+        statefile = statefile or self.statefile
+        if not statefile:
+            raise ValueError("no statefile")
+        return pathlib.Path(statefile)
+
+    def _autosave(self, timestamp):
+        self._nextsave = timestamp + self.saveinterval.total_seconds()
+        try:
+            self.save()
+        except OSError as exc:
+            _LOGGER.warning("Cannot save prioritizer state to %s (%s)", self.statefile, exc)
+
+
+def _get_digest(values):
+    # stable across processes, unlike `hash`
+    return zlib.crc32(repr(values).encode())
+
 
 def _cast_threshold(threshold):
     if not isinstance(threshold, timedelta):
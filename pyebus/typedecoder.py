@@ -1,5 +1,11 @@
-"""EBUSD Typecode Decoder."""
+"""
+EBUSD Typecode Decoder.
+
+:any:`decode_type` returns one shared :any:`Type` instance per typecode and divider.
+The registry is safe for concurrent use and holds all builtin types from the start.
+"""
 import re
+import threading
 
 from . import types
 
@@ -214,25 +220,50 @@ def decode_type(typecode, divider=None):
     >>> decode_type("SLR")
     IntType(-2147483647, 2147483647)
     """
-    # create missing types
-    if typecode not in TYPEMAP:
-        # STR       character string              Hello
-        # NTS       character string              Hello
-        if typecode.startswith(("STR:", "NTS:")):
-            TYPEMAP[typecode] = types.StrType(_get_length(typecode))
-        # HEX       hex digit string              hex octet sep by space
-        if typecode.startswith("HEX:"):
-            TYPEMAP[typecode] = types.HexType(_get_length(typecode))
-        # BI0     bit 0                         0...1
-        mat = _RE_BIT.match(typecode)
-        if mat:
-            TYPEMAP[typecode] = types.BoolType()
-    # get type
-    type_ = TYPEMAP[typecode]
-    # divider
+    key = (typecode, divider or None)
+    try:
+        return _REGISTRY[key]
+    except KeyError:
+        pass
+    type_ = _create_type(typecode)
     if divider:
         type_ = type_.with_divider(divider)
-    return type_
+    type_ = intern_type(type_)
+    with _LOCK:
+        return _REGISTRY.setdefault(key, type_)
+
+
+def _create_type(typecode):
+    try:
+        return TYPEMAP[typecode]
+    except KeyError:
+        pass
+    # STR       character string              Hello
+    # NTS       character string              Hello
+    if typecode.startswith(("STR:", "NTS:")):
+        return types.StrType(_get_length(typecode))
+    # HEX       hex digit string              hex octet sep by space
+    if typecode.startswith("HEX:"):
+        return types.HexType(_get_length(typecode))
+    # BI0     bit 0                         0...1
+    if _RE_BIT.match(typecode):
+        return types.BoolType()
+    raise KeyError(typecode)
+
+
+def intern_type(type_):
+    """
+    Return the shared instance of all types equal to `type_`.
+
+    >>> intern_type(types.IntType(0, 10, divider=2)) is intern_type(types.IntType(0, 10, divider=2))
+    True
+    """
+    try:
+        return _TYPES[type_]
+    except KeyError:
+        pass
+    with _LOCK:
+        return _TYPES.setdefault(type_, type_)
 
 
 def _get_length(typecode):
@@ -240,3 +271,23 @@ def _get_length(typecode):
     if length != "*":
         return int(length)
     return None
+
+
+# `(typecode, divider)` -> Type and Type -> Type. Lookups run without lock, just insertions are serialized.
+_LOCK = threading.Lock()
+_REGISTRY = {}
+_TYPES = {}
+
+
+def _prewarm():
+    for typecode in TYPEMAP:
+        decode_type(typecode)
+    for bit in range(10):
+        decode_type(f"BI{bit}")
+        for length in range(10):
+            decode_type(f"BI{bit}:{length}")
+    for typecode in ("STR:*", "NTS:*", "HEX:*"):
+        decode_type(typecode)
+
+
+_prewarm()
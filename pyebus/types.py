@@ -1,15 +1,20 @@
 """Type Engine."""
 import datetime
+import itertools
 import re
 
 from .util import repr_
 
-# pylint: disable=abstract-method
+# pylint: disable=abstract-method,too-many-lines
+
+_MISSING = object()
 
 
 class Type:
     """Abstract Type."""
 
+    __slots__ = tuple()
+
     def __init__(self):
         pass
 
@@ -89,13 +94,27 @@ class EnumType(Type):
     Traceback (most recent call last):
       ...
     ValueError: Unknown value 'super'. Allowed values are on, auto, off.
+
+    Values are looked up in a table. Pure integer values are always decoded as integer:
+
+    >>> t = EnumType(('10', 'on'))
+    >>> t.decode('10')
+    10
+    >>> t.encode('10')
+    '10'
     """
 
+    __slots__ = ("_values", "_decodemap", "_valueset")
+
     _re_digit = re.compile(r"^\d+$")
 
     def __init__(self, values):
         super().__init__()
         self._values = values
+        # pure integer values are decoded to int and therefore not part of the lookup table
+        self._decodemap = {value: value for value in values if not self._re_digit.match(value)}
+        self._decodemap["-"] = None
+        self._valueset = frozenset(values)
 
     @property
     def values(self):
@@ -107,20 +126,21 @@ class EnumType(Type):
 
     def decode(self, value):
         """Decode `value`."""
-        if value == "-":
-            value = None
-        elif self._re_digit.match(value):
-            value = int(value)
+        decoded = self._decodemap.get(value, _MISSING)
+        if decoded is not _MISSING:
+            return decoded
+        if self._re_digit.match(value):
             # It does not matter to loop up the value, as it would have been found by ebusd
-        elif value not in self._values:
-            values = ", ".join(self._values)
-            raise ValueError(f"Unknown value '{value}'. Allowed values are {values}.")
-        return value
+            return int(value)
+        values = ", ".join(self._values)
+        raise ValueError(f"Unknown value '{value}'. Allowed values are {values}.")
 
     def encode(self, value):
         """Encode `value`."""
         if value is None:
             value = "-"
+        elif isinstance(value, str) and value in self._valueset:
+            pass
         elif isinstance(value, int) or self._re_digit.match(str(value)):
             value = str(value)
         elif value not in self._values:
@@ -174,6 +194,8 @@ class StrType(Type):
     'Up to 10 characters'
     """
 
+    __slots__ = ("_length",)
+
     def __init__(self, length=None):
         super().__init__()
         self._length = length
@@ -251,6 +273,8 @@ class HexType(Type):
     '3 Hex Bytes'
     """
 
+    __slots__ = ("_length",)
+
     def __init__(self, length=None):
         super().__init__()
         self._length = length
@@ -379,6 +403,8 @@ class IntType(Type):
     ValueError: Value -5.0 deceeds lower limit of -4
     """
 
+    __slots__ = ("_min", "_max", "_divider")
+
     def __init__(self, min_, max_, divider=None):
         super().__init__()
         self._min = min_
@@ -502,21 +528,24 @@ class BoolType(Type):
     ValueError: blub is not a valid boolean
     """
 
+    __slots__ = tuple()
+
+    _DECODEMAP = {"0": False, "1": True, "-": None, "": None}
+    _ENCODEMAP = {"0": 0, "false": 0, "1": 1, "true": 1}
+
     def decode(self, value):
         """Decode `value`."""
-        if value not in ("-", ""):
-            return bool(int(value))
-
-        return None
+        decoded = self._DECODEMAP.get(value, _MISSING)
+        if decoded is not _MISSING:
+            return decoded
+        return bool(int(value))
 
     def encode(self, value):
         """Encode `value`."""
         if value is not None:
-            valuestr = str(value).lower()
-            if valuestr in ("1", "true"):
-                return 1
-            if valuestr in ("0", "false"):
-                return 0
+            encoded = self._ENCODEMAP.get(str(value).lower(), _MISSING)
+            if encoded is not _MISSING:
+                return encoded
 
             raise ValueError(f"{value} is not a valid boolean")
 
@@ -551,6 +580,8 @@ class FloatType(Type):
     '-'
     """
 
+    __slots__ = tuple()
+
     def decode(self, value):
         """Decode `value`."""
         if value not in ("-", ""):
@@ -597,19 +628,21 @@ class DateType(Type):
     '-.-.-'
     """
 
+    __slots__ = tuple()
+
     _NONE = "-.-.-"
 
     def decode(self, value):
         """Decode `value`."""
         if value != self._NONE:
-            return datetime.datetime.strptime(value, "%d.%m.%Y").date()
+            return _decode_date(value)
 
         return None
 
     def encode(self, value):
         """Encode `value`."""
         if isinstance(value, str):
-            value = datetime.datetime.strptime(value, "%d.%m.%Y").date()
+            value = _decode_date(value)
         if value is not None:
             return f"{value.day}.{value.month}.{value.year}"
 
@@ -643,20 +676,21 @@ class TimeType(Type):
     '-:-:-'
     """
 
+    __slots__ = tuple()
+
     _NONE = "-:-:-"
 
     def decode(self, value):
         """Decode `value`."""
         if value != self._NONE:
-            tstamp = datetime.datetime.strptime(value, "%H:%M:%S")
-            return Time(tstamp.hour, tstamp.minute, tstamp.second)
+            return _decode_time(value)
 
         return None
 
     def encode(self, value):
         """Encode `value`."""
         if isinstance(value, str):
-            value = datetime.datetime.strptime(value, "%H:%M:%S")
+            value = _decode_time(value)
         if value is not None:
             return f"{value.hour:02d}:{value.minute:02d}:{value.second:02d}"
 
@@ -723,11 +757,16 @@ class HourMinuteType(TimeType):
     '-:-'
     """
 
+    __slots__ = ("_minres", "_cache")
+
     _NONE = "-:-"
 
+    CACHESIZE = 2048
+
     def __init__(self, minres=None):
         super().__init__()
         self._minres = minres
+        self._cache = {}
 
     @property
     def minres(self):
@@ -739,9 +778,20 @@ class HourMinuteType(TimeType):
 
     def decode(self, value):
         """Decode `value`."""
+        cache = self._cache
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        decoded = self._decode(value)
+        # a day has just 1440 minutes, so the cache limit is just a safety net
+        if len(cache) < self.CACHESIZE:
+            cache[value] = decoded
+        return decoded
+
+    def _decode(self, value):
         if value != self._NONE:
-            value = datetime.datetime.strptime(value, "%H:%M")
-            value = HourMinute(value.hour, value.minute)
+            value = _decode_hourminute(value)
             if self._minres and (value.minute % self._minres) != 0:
                 raise ValueError(f"Minute of {value} must be multiple of {self._minres}")
             return value
@@ -751,7 +801,7 @@ class HourMinuteType(TimeType):
     def encode(self, value):
         """Encode `value`."""
         if isinstance(value, str):
-            value = datetime.datetime.strptime(value, "%H:%M")
+            value = _decode_hourminute(value)
         if value is not None:
             if self._minres and (value.minute % self._minres) != 0:
                 raise ValueError(f"Minute of {value} must be multiple of {self._minres}")
@@ -789,18 +839,20 @@ class DateTimeType(Type):
     '-.-.- -:-:-'
     """
 
+    __slots__ = tuple()
+
     _NONE = "-.-.- -:-:-"
 
     def decode(self, value):
         """Decode `value`."""
         if value != self._NONE:
-            return DateTime.strptime(value, "%d.%m.%Y %H:%M:%S")
+            return _decode_datetime(value)
         return None
 
     def encode(self, value):
         """Encode `value`."""
         if isinstance(value, str):
-            value = DateTime.strptime(value, "%d.%m.%Y %H:%M:%S")
+            value = _decode_datetime(value)
         if value is not None:
             return f"{value.day}.{value.month}.{value.year} {value.hour:02d}:{value.minute:02d}:{value.second:02d}"
         return self._NONE
@@ -824,6 +876,8 @@ class WeekdayType(Type):
     'a'
     """
 
+    __slots__ = tuple()
+
     def decode(self, value):
         """Decode `value`."""
         return value
@@ -852,6 +906,8 @@ class PinType(Type):
     'a'
     """
 
+    __slots__ = tuple()
+
     def decode(self, value):
         """Decode `value`."""
         return value
@@ -929,3 +985,78 @@ def _try_int(value):
     if float(value) == float(intvalue):
         value = intvalue
     return value
+
+
+# Allowed digit counts of day, month and year and of hour, minute and second,
+# like the corresponding `strptime` directives.
+_DATELENS = frozenset(itertools.product((1, 2), (1, 2), (4,)))
+_TIMELENS = frozenset(itertools.product((1, 2), (1, 2), (1, 2)))
+_HOURMINUTELENS = frozenset(itertools.product((1, 2), (1, 2)))
+
+
+def _split_ints(value, sep, lens):
+    """
+    Split `value` at `sep` into integers with digit counts `lens`.
+
+    Returns `None`, if `value` does not follow that format.
+
+    >>> _split_ints('30.1.2020', '.', _DATELENS)
+    [30, 1, 2020]
+    >>> _split_ints('30.1.20', '.', _DATELENS)
+    """
+    parts = value.split(sep)
+    if tuple(map(len, parts)) in lens:
+        digits = "".join(parts)
+        if digits.isdigit() and digits.isascii():
+            return list(map(int, parts))
+    return None
+
+
+# The decoders below handle the plain formats directly and use `strptime` for anything else,
+# which also creates the proper error messages.
+
+
+def _decode_date(value):
+    ints = _split_ints(value, ".", _DATELENS)
+    if ints:
+        day, month, year = ints
+        try:
+            return datetime.date(year, month, day)
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, "%d.%m.%Y").date()
+
+
+def _decode_time(value):
+    ints = _split_ints(value, ":", _TIMELENS)
+    if ints:
+        try:
+            return Time(*ints)
+        except ValueError:
+            pass
+    tstamp = datetime.datetime.strptime(value, "%H:%M:%S")
+    return Time(tstamp.hour, tstamp.minute, tstamp.second)
+
+
+def _decode_hourminute(value):
+    ints = _split_ints(value, ":", _HOURMINUTELENS)
+    if ints:
+        try:
+            return HourMinute(*ints)
+        except ValueError:
+            pass
+    tstamp = datetime.datetime.strptime(value, "%H:%M")
+    return HourMinute(tstamp.hour, tstamp.minute)
+
+
+def _decode_datetime(value):
+    datestr, _, timestr = value.partition(" ")
+    dateints = _split_ints(datestr, ".", _DATELENS)
+    timeints = _split_ints(timestr, ":", _TIMELENS)
+    if dateints and timeints:
+        day, month, year = dateints
+        try:
+            return DateTime(year, month, day, *timeints)
+        except ValueError:
+            pass
+    return DateTime.strptime(value, "%d.%m.%Y %H:%M:%S")
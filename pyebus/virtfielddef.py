@@ -9,6 +9,8 @@ from .const import NA
 from .msgdef import VirtFieldDef
 from .types import DateTimeType, DateType, HourMinuteType, TimeType
 
+_DATETIMETYPE = DateTimeType()
+
 
 def iter_virtfielddefs(fielddefs):
     """Iterate over Generic Field Definitions."""
@@ -24,13 +26,13 @@ def iter_virtfielddefs(fielddefs):
                 sidx = names.index("dcfstate")
                 yield VirtFieldDef(
                     f"{names[didx]}+{names[tidx]}+dcfstate",
-                    DateTimeType(),
+                    _DATETIMETYPE,
                     lambda fields: _merge_date_time(fields[didx].value, fields[tidx].value, fields[sidx].value),
                 )
             else:
                 yield VirtFieldDef(
                     f"{names[didx]}+{names[tidx]}",
-                    DateTimeType(),
+                    _DATETIMETYPE,
                     lambda fields: _merge_date_time(fields[didx].value, fields[tidx].value),
                 )
     if DateType in typeclss and HourMinuteType in typeclss:
@@ -41,7 +43,7 @@ def iter_virtfielddefs(fielddefs):
         if abs(didx - tidx) == 1:
             yield VirtFieldDef(
                 f"{names[didx]}+{names[tidx]}",
-                DateTimeType(),
+                _DATETIMETYPE,
                 lambda fields: _merge_date_time(fields[didx].value, fields[tidx].value),
             )
     if len(fielddefs) > 1 and names[-1] == "sensor":
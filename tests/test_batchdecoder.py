@@ -0,0 +1,90 @@
+"""Test Columnar Batch Decoding."""
+import pathlib
+
+import pytest
+
+from pyebus import NA, MsgDefs
+from pyebus.batchdecoder import decode_columns
+from pyebus.msgdecoder import MsgDecoder
+from pyebus.msgdefdecoder import decode_msgdef
+
+np = pytest.importorskip("numpy")
+TESTDATAPATH = pathlib.Path(__file__).parent / "testdata"
+
+
+def test_decode_columns():
+    """Columns of all relevant Types."""
+    msgdef = decode_msgdef(
+        "r,hc,Status,temp,s,D2C,,°C,,mode,s,UCH,0=off;1=on;2=auto,,,count,s,UCH,,,,hex,s,HEX:2,,,,name,s,STR:3,,,"
+    )
+    valuestrs = [
+        "21.5;on;3;01 02;abc",
+        "-;auto;-;;",
+        "20.0;7;300;ff ff;abcd",
+        "19.5;on",
+        "ERR: timeout",
+        "nosignal",
+        "x;super;2;01 02;abc",
+    ]
+    temp, mode, count, hex_, name = decode_columns(msgdef, valuestrs)
+
+    assert temp.fielddef is msgdef.fields[0]
+    assert temp.values.dtype == np.float64
+    assert temp.mask.tolist() == [False, True, False, False, True, True, True]
+    assert temp.values[~temp.mask].tolist() == [21.5, 20.0, 19.5]
+    assert np.isnan(temp.values[temp.mask]).all()
+    assert temp.categories is None
+
+    assert mode.values.dtype == np.int32
+    assert mode.categories == ("off", "on", "auto", 7)
+    assert mode.values.tolist() == [1, 2, 3, 1, -1, -1, -1]
+    assert mode.mask.tolist() == [False, False, False, False, True, True, True]
+
+    assert count.values.dtype == np.int64
+    assert count.values.tolist() == [3, 0, 0, 0, 0, 0, 2]
+    assert count.mask.tolist() == [False, True, True, True, True, True, False]
+
+    assert hex_.values.dtype == object
+    assert hex_.values.tolist() == [(1, 2), None, (255, 255), NA, NA, NA, (1, 2)]
+    assert hex_.mask.tolist() == [False, True, False, True, True, True, False]
+
+    assert name.values.tolist() == ["abc", "", None, NA, NA, NA, "abc"]
+    assert name.mask.tolist() == [False, False, True, True, True, True, False]
+
+
+def test_decode_columns_empty():
+    """No Values."""
+    msgdef = decode_msgdef("r,hc,Status,temp,s,D2C,,°C,,mode,s,UCH,0=off;1=on;2=auto,,")
+    temp, mode = decode_columns(msgdef, [])
+    assert temp.values.shape == (0,)
+    assert mode.values.shape == (0,)
+    assert mode.mask.shape == (0,)
+
+
+def test_decode_columns_listen0b():
+    """Columns match the message decoder on `listen0b.txt`."""
+    msgdefs = MsgDefs()
+    for line in (TESTDATAPATH / "find0.txt").read_text().splitlines():
+        try:
+            msgdefs.add(decode_msgdef(line))
+        except ValueError:
+            pass
+    decoder = MsgDecoder(msgdefs)
+    msgs = {}
+    for line in (TESTDATAPATH / "listen0b.txt").read_text().splitlines():
+        circuit, name, valuestr = line.split(" ", 2)
+        msgdef = msgdefs.get(circuit, name)
+        if valuestr.startswith("= "):
+            valuestr = valuestr[2:]
+        msgs.setdefault(msgdef, []).append((valuestr, decoder.decode_value(msgdef, valuestr)))
+    for msgdef, items in msgs.items():
+        columns = decode_columns(msgdef, [valuestr for valuestr, _ in items])
+        for row, (_, msg) in enumerate(items):
+            fields = msg.fields if msg.valid else ()
+            for column, field in zip(columns, fields):
+                if column.mask[row]:
+                    assert field.value in (None, NA)
+                elif column.categories:
+                    assert column.categories[column.values[row]] == field.value
+                else:
+                    assert column.values[row] == field.value
@@ -0,0 +1,92 @@
+"""Test Configuration Loader."""
+import pathlib
+import shutil
+
+from pyebus import CircuitInfo
+from pyebus.configloader import ConfigLoader, load_msgdefs
+from pyebus.msgdefdecoder import decode_msgdefs
+
+TESTDATAPATH = pathlib.Path(__file__).parent / "testdata"
+
+BAI = CircuitInfo("bai", "Vaillant", "BAI00", "0204", "9602", 0x08)
+MC4 = CircuitInfo("mc.4", "Vaillant", "MC2  ", "0500", "6301", 0x52)
+
+
+def test_load():
+    """Message definitions are the same as retrieved from ebusd."""
+    msgdefs = load_msgdefs(TESTDATAPATH / "config", [MC4, BAI])
+    assert list(msgdefs) == list(
+        decode_msgdefs(
+            [
+                "u,broadcast,outsidetemp,temp2,m,D2B,,°C,Außentemperatur",
+                "r1,mc.4,Status,temp,,D2C,,°C,Temperatur,mixer,,UCH,10,%,,pump,,UCH,0=aus;1=an,,",
+                "w,mc.4,Mode,mode,,UCH,0=off;1=on;2=auto,,",
+                "r,mc.4,currenterror,error,,UIN,,,,error,,UIN,,,",
+                "r,bai,FlowTemp,temp,,D2C,,°C,Vorlauftemperatur,sensor,,UCH,0=ok;85=circuit;170=cutoff,,Fühlerstatus",
+                'r,bai,AntiCondensValue,power,,UCH,,kW,"Anhebung, minimale Leistung"',
+                "r5,bai,Pump,onoff,,UCH,0=aus;1=an,,",
+                "w,bai,FlowTempDesired,temp,,D2C,,°C,Temperatur",
+                "r,bai,currenterror,error,,UIN,,,,error,,UIN,,,",
+            ]
+        )
+    )
+    assert [str(msgdef.virtfields) for msgdef in msgdefs if msgdef.virtfields] == [
+        "(VirtFieldDef('temp+sensor', IntType(-2047.9, 2047.9, divider=16)),)"
+    ]
+
+
+def test_select():
+    """File selection by circuit information."""
+    loader = ConfigLoader(TESTDATAPATH / "config")
+    assert [msgdef.ident for msgdef in loader.load_msgdefs([])] == ["broadcast/outsidetemp"]
+    # most specific file
+    bai = BAI._replace(hwversion="7603")
+    assert [str(msgdef) for msgdef in loader.load_msgdefs([bai]) if msgdef.circuit == "bai"] == [
+        "MsgDef('bai', 'FlowTemp', (FieldDef(0, 'temp1', IntType(0, 100, divider=2), unit='°C', comment='Temperatur'),)"
+        ", read=True)"
+    ]
+    # condition
+    bai = BAI._replace(swversion="0413")
+    assert str(loader.load_msgdefs([bai]).get("bai", "APCLegioProtection")) == (
+        "MsgDef('bai', 'APCLegioProtection', (FieldDef(0, '', IntType(0, 254), comment='Legionellenschutz'),)"
+        ", read=True, conditions=(Condition('SW', '>=', (413,)),))"
+    )
+    # no match
+    assert len(loader.load_msgdefs([BAI._replace(address=0x09)])) == 1
+    assert len(loader.load_msgdefs([BAI._replace(model="VR630")])) == 1
+    assert len(loader.load_msgdefs([BAI._replace(manufacturer="Wolf")])) == 1
+    # all
+    assert len(loader.load_msgdefs()) == 11
+
+
+def test_cache(tmp_path):
+    """Files are read and decoded once until modified."""
+    shutil.copytree(TESTDATAPATH / "config", tmp_path, dirs_exist_ok=True)
+    loader = ConfigLoader(tmp_path)
+    first = list(loader.load_msgdefs([BAI]))
+    second = list(loader.load_msgdefs([BAI]))
+    assert all(msgdef is other for msgdef, other in zip(first, second))
+
+    # include modified
+    errors = tmp_path / "vaillant" / "errors.inc"
+    errors.write_text(errors.read_text().replace("currenterror", "error"))
+    third = list(loader.load_msgdefs([BAI]))
+    assert [msgdef.name for msgdef in third][-1] == "error"
+    assert third[0] is first[0]
+
+    # template modified
+    (tmp_path / "vaillant" / "_templates.csv").write_text("power,UIN,,W,Leistung\n")
+    fourth = loader.load_msgdefs([BAI])
+    assert str(fourth.get("bai", "AntiCondensValue").children) == (
+        "(FieldDef(0, 'power', IntType(0, 65534), unit='W', comment='Anhebung, minimale Leistung'),)"
+    )
+
+
+def test_include_cycle(tmp_path, caplog):
+    """Recursive includes are skipped."""
+    shutil.copytree(TESTDATAPATH / "config", tmp_path, dirs_exist_ok=True)
+    errors = tmp_path / "vaillant" / "errors.inc"
+    errors.write_text(errors.read_text() + "!include,errors.inc\n")
+    msgdefs = ConfigLoader(tmp_path).load_msgdefs([BAI])
+    assert list(msgdefs) == list(load_msgdefs(TESTDATAPATH / "config", [BAI]))
+    assert "Skipping recursive include" in caplog.text
@@ -103,14 +103,13 @@ def test_running():
 
     async def test():
         await ebus.async_wait_scancompleted()
+        assert ebus.circuitinfos == tuple()
         await ebus.async_load_msgdefs()
         assert ebus.msgdefcodes == dummydata.finddef
-        assert ebus.msgdefs.summary() == "31 messages (30 read, 1 update, 2 write) with 33 fields"
+        assert ebus.msgdefs.summary() == "30 messages (30 read, 0 update, 2 write) with 32 fields"
         msgdefs = ebus.msgdefs
         allmsgdefs = msgdefs.resolve("*/*")
 
-        assert ebus.circuitinfos == tuple()
-        await ebus.async_load_circuitinfos()
         assert ebus.circuitinfos == (
             pyebus.CircuitInfo("bai", "Vaillant", "BAI00", "0204", "9602", 8),
             pyebus.CircuitInfo("cc", "Vaillant", "VR630", "0500", "6301", 35),
@@ -135,7 +134,7 @@ def test_running():
         assert msgdefs is ebus.msgdefs
 
         ebus.msgdefs = allmsgdefs
-        assert ebus.msgdefs.summary() == "31 messages (30 read, 1 update, 2 write) with 33 fields"
+        assert ebus.msgdefs.summary() == "30 messages (30 read, 0 update, 2 write) with 32 fields"
 
     run(test)
 
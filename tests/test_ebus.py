@@ -106,14 +106,13 @@ def test_running():
 
     async def test():
         await ebus.async_wait_scancompleted()
+        assert ebus.circuitinfos == tuple()
+        # bai/APCLegioProtection requires SW>=413, bai has SW 0204
         await ebus.async_load_msgdefs()
         assert ebus.msgdefcodes == server.dummydata.finddef
-        assert ebus.msgdefs.summary() == "31 messages (30 read, 1 update, 2 write) with 33 fields"
+        assert ebus.msgdefs.summary() == "30 messages (30 read, 0 update, 2 write) with 32 fields"
+        assert ebus.msgdefs.get("bai", "APCLegioProtection") is None
         msgdefs = ebus.msgdefs
-        allmsgdefs = msgdefs.resolve("*/*")
-
-        assert ebus.circuitinfos == tuple()
-        await ebus.async_load_circuitinfos()
         assert ebus.circuitinfos == (
             pyebus.CircuitInfo("bai", "Vaillant", "BAI00", "0204", "9602", 8),
             pyebus.CircuitInfo("cc", "Vaillant", "VR630", "0500", "6301", 35),
@@ -132,13 +131,28 @@ def test_running():
         assert ebus.get_circuitinfo("rcc.3") == pyebus.CircuitInfo("rcc.3", "Vaillant", "RC C", "0508", "6201", 245)
         assert ebus.get_circuitinfo("unknown") is None
 
+        # without circuit information all definitions apply
+        circuitinfos = ebus.circuitinfos
+        ebus.circuitinfos = tuple()
+        ebus.decode_msgdefcodes()
+        assert ebus.msgdefs.summary() == "31 messages (31 read, 0 update, 2 write) with 33 fields"
+        allmsgdefs = msgdefs.resolve("*/*")
+        ebus.circuitinfos = circuitinfos
+
+        # reload reuses the already decoded definitions, the ones not applying to bai SW 0204 are skipped
+        await ebus.async_load_msgdefcodes(add=True)
+        assert ebus.msgdefcodes == server.dummydata.finddef
+        ebus.decode_msgdefcodes()
+        assert msgdefs is ebus.msgdefs
+        assert list(ebus.msgdefs) == [msgdef for msgdef in allmsgdefs if msgdef.name != "APCLegioProtection"]
+
         ebus.msgdefcodes = [""]
         ebus.decode_msgdefcodes()
         assert ebus.msgdefs.summary() == "0 messages (0 read, 0 update, 0 write) with 0 fields"
         assert msgdefs is ebus.msgdefs
 
         ebus.msgdefs = allmsgdefs
-        assert ebus.msgdefs.summary() == "31 messages (30 read, 1 update, 2 write) with 33 fields"
+        assert ebus.msgdefs.summary() == "31 messages (31 read, 0 update, 2 write) with 33 fields"
 
     run(test, server=server)
 
@@ -183,6 +197,7 @@ def test_observe():
     ebus = pyebus.Ebus(port=UNUSED_PORT)
 
     async def test():
+        # bai/APCLegioProtection requires SW>=413, bai has SW 0204 and is not read
         await ebus.async_load_msgdefs()
 
         assert not server.prios
@@ -270,6 +285,82 @@ def test_observe_filter():
     run(test, server=server)
 
 
+def test_listen_lazy():
+    """Listen Lazy."""
+    server = pyebus.DummyServer(port=UNUSED_PORT)
+    ebus = pyebus.Ebus(port=UNUSED_PORT)
+
+    async def test():
+        await ebus.async_load_msgdefs()
+        msgs = []
+        async for msg in ebus.async_listen(lazy=True):
+            assert isinstance(msg, pyebus.LazyMsg)
+            msgs.append((msg.ident, msg.values))
+        assert msgs == [
+            ("bai/FlowTemp", (0.125, "ok", 0.125)),
+            ("bai/FlowTemp", (1.125, "ok", 1.125)),
+            ("bai/FlowTemp", (2.125, "ok", 2.125)),
+            ("bai/FlowTemp", (None, pyebus.NA, pyebus.NA)),
+            ("bai/FlowTemp", (None, None, None)),
+            ("bai/FlowTemp", (3.125, "ok", 3.125)),
+        ]
+
+    run(test, server=server)
+
+
+def test_listen_values_only():
+    """Listen Values Only."""
+    server = pyebus.DummyServer(port=UNUSED_PORT)
+    ebus = pyebus.Ebus(port=UNUSED_PORT)
+    server.dummydata.listen.insert(2, "bai FlowTemp = ERR: element not found")
+
+    async def test():
+        await ebus.async_load_msgdefs()
+        msgs = []
+        msgdefs = ebus.msgdefs.resolve("bai/FlowTemp/temp")
+        async for ident, values, timestamp in ebus.async_listen(msgdefs, values_only=True):
+            assert isinstance(timestamp, float)
+            msgs.append((ident, values))
+        assert msgs == [
+            ("bai/FlowTemp", (0.125,)),
+            ("bai/FlowTemp", (1.125,)),
+            ("bai/FlowTemp", None),
+            ("bai/FlowTemp", (2.125,)),
+            ("bai/FlowTemp", (None,)),
+            ("bai/FlowTemp", (None,)),
+            ("bai/FlowTemp", (3.125,)),
+        ]
+
+    run(test, server=server)
+
+
+def test_observe_values_only():
+    """Observe Values Only."""
+    server = pyebus.DummyServer(port=UNUSED_PORT)
+    ebus = pyebus.Ebus(port=UNUSED_PORT)
+    server.dummydata.listen.insert(2, "bai FlowTemp = ERR: element not found")
+
+    async def test():
+        await ebus.async_load_msgdefs()
+        msgs = []
+        msgdefs = ebus.msgdefs.resolve("bai/FlowTemp")
+        async for ident, values, _ in ebus.async_observe(msgdefs, values_only=True):
+            msgs.append((ident, values))
+        assert msgs == [
+            ("bai/FlowTemp", (0.0, pyebus.NA, pyebus.NA)),
+            ("bai/FlowTemp", (6.125, "ok", 6.125)),
+            ("bai/FlowTemp", (0.125, "ok", 0.125)),
+            ("bai/FlowTemp", (1.125, "ok", 1.125)),
+            ("bai/FlowTemp", None),
+            ("bai/FlowTemp", (2.125, "ok", 2.125)),
+            ("bai/FlowTemp", (None, pyebus.NA, pyebus.NA)),
+            ("bai/FlowTemp", (None, None, None)),
+            ("bai/FlowTemp", (3.125, "ok", 3.125)),
+        ]
+
+    run(test, server=server)
+
+
 def test_listen_broken():
     """Listen Broken."""
     server = pyebus.DummyServer(port=UNUSED_PORT)
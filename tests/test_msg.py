@@ -1,6 +1,7 @@
 """Test Messages."""
 
 import pyebus
+from pyebus.msg import MsgFilter, ValueFields, filter_msg
 
 
 def test_msgdef0():
@@ -49,3 +50,38 @@ def test_filter_msg():
     assert msg0.values == ("4",)
     assert msg5.values == ("5",)
     assert b.values == tuple()
+
+
+def test_msgfilter():
+    """Compiled Message Filtering."""
+    fielddef0 = pyebus.FieldDef(0, "uname.0", pyebus.types.Type(), "unit")
+    fielddef1 = pyebus.FieldDef(1, "uname.1", pyebus.types.Type(), "unit")
+    fielddef5 = pyebus.FieldDef(0, "uname", pyebus.types.Type(), "unit")
+    msgdef01 = pyebus.MsgDef("circuit0", "name", (fielddef0, fielddef1), True, 5, False, False)
+    msgdef5 = pyebus.MsgDef("circuit5", "name", (fielddef5,), True, 5, False, False)
+    msgdef1 = msgdef01.replace(children=msgdef01.fields[1:])
+
+    msg01 = pyebus.Msg(msgdef01, (pyebus.Field(fielddef0, "4"), pyebus.Field(fielddef1, "5")))
+    msg5 = pyebus.Msg(msgdef5, (pyebus.Field(fielddef5, "5"),))
+    b = pyebus.BrokenMsg(msgdef01, "error")
+
+    msgfilter = MsgFilter([msgdef5, msgdef1])
+    assert len(msgfilter) == 2
+    assert "circuit0/name" in msgfilter
+    assert filter_msg(msg5, msgfilter) is msg5
+    for _ in range(2):
+        assert filter_msg(msg01, msgfilter) == pyebus.Msg(msgdef1, (pyebus.Field(fielddef1, "5"),))
+        assert filter_msg(msg01, msgfilter) == filter_msg(msg01, [msgdef5, msgdef1])
+    assert filter_msg(b, msgfilter) is b
+    assert filter_msg(None, msgfilter) is None
+    assert filter_msg(msg5, MsgFilter([msgdef01])) is None
+
+    # other field layout of the same message
+    msg0 = pyebus.Msg(msgdef01, (pyebus.Field(fielddef0, "4"),))
+    assert filter_msg(msg0, msgfilter).values == ()
+
+    # compact messages stay compact
+    compactmsg = pyebus.CompactMsg(msgdef01, ValueFields((fielddef0, fielddef1), ("4", "5")))
+    stripped = filter_msg(compactmsg, msgfilter)
+    assert isinstance(stripped, pyebus.CompactMsg)
+    assert stripped.values == ("5",)
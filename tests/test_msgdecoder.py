@@ -1,7 +1,11 @@
 """Test Message Decoder."""
 import pathlib
+import re
 
-from pyebus import FieldDef, MsgDef, MsgDefs, UnknownMsgError, types
+import pytest
+
+from pyebus import NA, CompactMsg, FieldDef, LazyMsg, MsgDef, MsgDefs, UnknownMsgError, types
+from pyebus.msg import MsgFilter, filter_msg
 from pyebus.msgdecoder import MsgDecoder
 from pyebus.msgdefdecoder import decode_msgdef
 
@@ -10,6 +14,29 @@ from .util import cmp_
 TESTDATAPATH = pathlib.Path(__file__).parent / "testdata"
 
 
+class _RecordingType(types.IntType):
+    """Integer Type, which records the strings to decode in `decoded`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded = []
+
+    def decode(self, value):
+        self.decoded.append(value)
+        return super().decode(value)
+
+
+def _load_msgdefs(filepath):
+    """Load message definitions from `filepath`, skipping invalid ones."""
+    msgdefs = MsgDefs()
+    for line in filepath.read_text().splitlines():
+        try:
+            msgdefs.add(decode_msgdef(line))
+        except ValueError:
+            pass
+    return msgdefs
+
+
 def test_listen0a():
     """Process `listen0a.txt`."""
     _test(TESTDATAPATH / "find0.txt", TESTDATAPATH / "listen0a", 777)
@@ -74,3 +101,177 @@ def test_noidx():
     decoder = MsgDecoder(msgdefs)
     msg = decoder.decode_line("cc StatPowerOn = 55")
     assert msg.values == (55,)
+
+
+def test_plancache(monkeypatch):
+    """Decode plans are cached per message definition."""
+    msgdefs = MsgDefs()
+    msgdefs.add(decode_msgdef("r,mc,Status,temp,s,D2C,,°C,Temperatur,onoff,s,UCH,0=off;1=on,,Status"))
+    msgdefs.add(decode_msgdef("r,hc,Status,temp,s,D2C,,°C,Temperatur"))
+    decoder = MsgDecoder(msgdefs)
+    monkeypatch.setattr(decoder, "PLANCACHESIZE", 1)
+    msg = decoder.decode_line("mc Status = 21.5;on")
+    assert msg.values == (21.5, "on")
+    assert msg.fields[0].fielddef is msgdefs.get("mc", "Status").fields[0]
+    assert decoder.decode_line("mc Status = 21.5").values == (21.5, NA)
+    assert decoder.decode_line("mc Status = x;on").values == (None, "on")
+    assert decoder.decode_line("hc Status = nosignal").values == (NA,)
+    assert decoder.decode_line("mc Status = no data stored").values == (NA, NA)
+
+    # an equal, but new message definition must not reuse the plan of the former one
+    msgdef = msgdefs.get("mc", "Status").replace()
+    msg = decoder.decode_value(msgdef, "21.5;off")
+    assert msg.values == (21.5, "off")
+    assert msg.fields[0].fielddef is msgdef.fields[0]
+
+
+def test_decode_line():
+    """Line Tokenizing."""
+    msgdefs = MsgDefs()
+    msgdefs.add(decode_msgdef("r,mc.4,Status,temp,s,UCH,,,"))
+    msgdefs.add(decode_msgdef("r,mc,Sta-tus,temp,s,UCH,,,"))
+    decoder = MsgDecoder(msgdefs)
+    assert decoder.decode_line("mc.4 Status = 5").values == (5,)
+    assert decoder.decode_line("mc.4 Status 5").values == (5,)
+    assert decoder.decode_line("mc.4 Status = 6\nfoo").values == (6,)
+    assert decoder.decode_line("mc Sta-tus =  7 ").values == (7,)
+    assert decoder.decode_line("mc.4 Status = ERR: timeout").error == "timeout"
+    for line in (
+        "",
+        "mc.4",
+        "mc.4 Status",
+        "mc. Status = 5",
+        "mc.4.1 Status = 5",
+        "mc-4 Status = 5",
+        "mc.4 Sta\ttus = 5",
+    ):
+        with pytest.raises(ValueError, match="^" + re.escape(line) + "$"):
+            decoder.decode_line(line)
+    with pytest.raises(UnknownMsgError, match=r"^circuit=mc\.5, name=Status$"):
+        decoder.decode_line("mc.5 Status = 5")
+
+    # definitions may change
+    msgdefs.add(decode_msgdef("r,mc.5,Status,temp,s,UCH,,,"))
+    assert decoder.decode_line("mc.5 Status = 5").values == (5,)
+    msgdefs.clear()
+    with pytest.raises(UnknownMsgError):
+        decoder.decode_line("mc.4 Status = 5")
+
+
+def test_lazy():
+    """Lazy Decoding."""
+    msgdefs = _load_msgdefs(TESTDATAPATH / "find0.txt")
+    decoder = MsgDecoder(msgdefs)
+    for line in (TESTDATAPATH / "listen0b.txt").read_text().splitlines():
+        msg = decoder.decode_line(line)
+        lazymsg = decoder.decode_line(line, lazy=True)
+        if msg.valid:
+            assert lazymsg == msg
+            assert lazymsg.values == msg.values
+            assert repr(lazymsg.fields) == repr(msg.fields)
+        else:
+            assert repr(lazymsg) == repr(msg)
+
+
+def test_lazy_access():
+    """Lazy Decoding just decodes accessed fields."""
+    type_ = _RecordingType(0, 100)
+    decoded = type_.decoded
+    fielddefs = [FieldDef(idx, f"f{idx}", type_) for idx in range(3)]
+    msgdef = MsgDef("cc", "Status", fielddefs, read=True)
+    msgdefs = MsgDefs()
+    msgdefs.add(msgdef)
+    decoder = MsgDecoder(msgdefs)
+
+    msg = decoder.decode_line("cc Status = 1;2;x", lazy=True)
+    assert isinstance(msg, LazyMsg)
+    assert not decoded
+    assert msg.fields[1].value == 2
+    assert msg.fields[1].value == 2
+    assert decoded == ["2"]
+    assert msg.fields[-1].value is None
+    assert [field.value for field in msg.fields[0:2]] == [1, 2]
+    assert decoded == ["2", "x", "1"]
+    assert len(msg.fields) == 3
+    with pytest.raises(IndexError):
+        msg.fields[3]  # pylint: disable=pointless-statement
+
+    decoded.clear()
+    msg = decoder.decode_line("cc Status = 1;2;3", lazy=True)
+    stripped = filter_msg(msg, [msgdef.replace(children=fielddefs[1:2])])
+    assert stripped.values == (2,)
+    assert decoded == ["2"]
+
+    assert decoder.decode_line("cc Status = nosignal", lazy=True).values == (NA, NA, NA)
+    assert not decoder.decode_line("cc Status = ERR: timeout", lazy=True).valid
+
+
+def test_compact():
+    """Compact Decoding."""
+    msgdefs = _load_msgdefs(TESTDATAPATH / "find0.txt")
+    decoder = MsgDecoder(msgdefs)
+    for line in (TESTDATAPATH / "listen0b.txt").read_text().splitlines():
+        msg = decoder.decode_line(line)
+        compactmsg = decoder.decode_line(line, compact=True)
+        if msg.valid:
+            assert isinstance(compactmsg, CompactMsg)
+            assert compactmsg == msg
+            assert compactmsg.values == msg.values
+            assert compactmsg.fields[:] == msg.fields
+        else:
+            assert repr(compactmsg) == repr(msg)
+
+    msgdef = msgdefs.get("bai", "FlowTemp")
+    msg = decoder.decode_value(msgdef, "1.5;ok", compact=True)
+    assert msg.values == (1.5, "ok", 1.5)
+    stripped = filter_msg(msg, msgdefs.resolve("bai/FlowTemp/temp"))
+    assert isinstance(stripped, CompactMsg)
+    assert stripped.values == (1.5,)
+    assert stripped.fields[0].fielddef.name == "temp"
+    assert decoder.decode_value(msgdef, "nosignal", compact=True).values == (NA, NA, NA)
+
+
+def test_msgfilter():
+    """Decoding with Message Filter is identical to filtering decoded messages."""
+    msgdefs = _load_msgdefs(TESTDATAPATH / "find0.txt")
+    decoder = MsgDecoder(msgdefs)
+    for pattern in ("*/*", "*/*/temp*", "*/*/*+*", "*/*/*date*", "bai/*"):
+        selected = msgdefs.resolve(pattern)
+        msgfilter = MsgFilter(selected)
+        for line in (TESTDATAPATH / "listen0b.txt").read_text().splitlines():
+            try:
+                msg = filter_msg(decoder.decode_line(line), selected)
+            except (UnknownMsgError, ValueError):
+                continue
+            for lazy, compact in ((False, False), (True, False), (False, True)):
+                projected = decoder.decode_line(line, lazy=lazy, compact=compact, msgfilter=msgfilter)
+                if msg is None or not msg.valid:
+                    assert repr(projected) == repr(msg)
+                else:
+                    assert projected == msg
+                    assert projected.values == msg.values
+
+
+def test_msgfilter_access():
+    """Decoding with Message Filter just decodes selected fields."""
+    type_ = _RecordingType(0, 100)
+    decoded = type_.decoded
+    msgdef = decode_msgdef("r,cc,Status,temp,s,D2C,,°C,,foo,s,UCH,,,,sensor,s,UCH,0=ok;1=short,,")
+    msgdef = msgdef.replace(children=msgdef.children[:1] + (FieldDef(1, "foo", type_),) + msgdef.children[2:])
+    msgdefs = MsgDefs()
+    msgdefs.add(msgdef)
+    decoder = MsgDecoder(msgdefs)
+
+    msgfilter = MsgFilter(msgdefs.resolve("cc/Status/foo"))
+    assert decoder.decode_line("cc Status = 1.5;2;ok", msgfilter=msgfilter).values == (2,)
+    assert decoded == ["2"]
+
+    decoded.clear()
+    # like filter_msg, stripped messages have no virtual fields
+    msgfilter = MsgFilter(msgdefs.resolve("cc/Status/temp+sensor"))
+    assert decoder.decode_line("cc Status = 1.5;2;ok", msgfilter=msgfilter).values == ()
+    assert decoder.decode_line("cc Status = nosignal", msgfilter=msgfilter).values == ()
+    assert not decoder.decode_line("cc Status = ERR: timeout", msgfilter=msgfilter).valid
+    assert not decoded
+
+    assert decoder.decode_line("cc Status = 1.5;2;ok", msgfilter=MsgFilter([])) is None
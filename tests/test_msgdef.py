@@ -13,7 +13,7 @@ def test_msgdef0():
     assert m.prio == 5
     assert m.write is False
     assert m.update is False
-    assert m.children == ()
+    assert not m.children
     assert m.access == "r---5"
     assert m.ident == "circuit/name"
     # assert sys.getsizeof(m) == 104
@@ -29,7 +29,7 @@ def test_msgdef1():
     assert m.prio is None
     assert m.write is True
     assert m.update is False
-    assert m.children == ()
+    assert not m.children
     assert m.access == "-w---"
     assert m.ident == "circuit/name"
     # assert sys.getsizeof(m) == 104
@@ -45,7 +45,7 @@ def test_msgdef2():
     assert m.prio is None
     assert m.write is False
     assert m.update is True
-    assert m.children == ()
+    assert not m.children
     assert m.access == "--u--"
     assert m.ident == "circuit/name"
     # assert sys.getsizeof(m) == 104
@@ -1,8 +1,10 @@
 """Test Message Decoder."""
 import pathlib
+import pickle
 
-from pyebus import util
-from pyebus.msgdefdecoder import decode_msgdef
+from pyebus import MsgDefs, msgdefdecoder, util
+from pyebus.msgdecoder import MsgDecoder
+from pyebus.msgdefdecoder import decode_msgdef, decode_msgdefs
 
 from .util import cmp_
 
@@ -41,6 +43,7 @@ def _test(basepath):
                             ("prio", msgdef.prio, None),
                             ("write", msgdef.write, False),
                             ("update", msgdef.update, False),
+                            ("conditions", msgdef.conditions, ()),
                         ],
                     )
                     outfile.write(f"\n{line}\n{msgdefrepr}\n")
@@ -49,3 +52,47 @@ def _test(basepath):
                 except ValueError as e:
                     outfile.write(f"{e}\n")
     cmp_(outfilepath, reffilepath)
+
+
+def test_shared():
+    """Equal types and strings are shared between field definitions."""
+    msgdef0 = decode_msgdef("r,mc,Status,temp,s,D2C,2,°C,Temperatur,onoff,s,UCH,0=off;1=on,,Status")
+    msgdef1 = decode_msgdef("r,hc,Status,temp,s,D2C,2,°C,Temperatur,onoff,s,UCH,0=off;1=on,,Status")
+    for fielddef0, fielddef1 in zip(msgdef0.children, msgdef1.children):
+        assert fielddef0.type_ is fielddef1.type_
+        assert fielddef0.unit is fielddef1.unit
+        assert fielddef0.comment is fielddef1.comment
+
+
+def test_decode_msgdefs(monkeypatch, caplog):
+    """Bulk Decoding - in-process and with worker processes."""
+    lines = (TESTDATAPATH / "find0.txt").read_text().splitlines()
+    refmsgdefs = MsgDefs()
+    for line in lines:
+        try:
+            refmsgdefs.add(decode_msgdef(line))
+        except ValueError:
+            pass
+
+    msgdefs = decode_msgdefs(lines, processes=1)
+    assert list(msgdefs) == list(refmsgdefs)
+    assert "Cannot decode message definition 'r,ui,FormatError,,'" in caplog.text
+
+    monkeypatch.setattr(msgdefdecoder, "PARALLELMIN", 0)
+    msgdefs = decode_msgdefs(lines, processes=2)
+    assert list(msgdefs) == list(refmsgdefs)
+    assert [msgdef.children for msgdef in msgdefs] == [msgdef.children for msgdef in refmsgdefs]
+    types = [fielddef.type_ for msgdef in msgdefs for fielddef in msgdef.fields]
+    reftypes = [fielddef.type_ for msgdef in refmsgdefs for fielddef in msgdef.fields]
+    assert all(type_ is reftype for type_, reftype in zip(types, reftypes))
+    msgdef = msgdefs.get("bai", "FlowTemp")
+    assert all(fielddef.parent is msgdef for fielddef in msgdef.children)
+    assert MsgDecoder(msgdefs).decode_value(msgdef, "1.5;ok").values == (1.5, "ok", 1.5)
+
+
+def test_pickle():
+    """Message Definitions without Virtual Fields are picklable."""
+    msgdef = decode_msgdef("r,mc,Status,temp,s,D2C,2,°C,Temperatur,onoff,s,UCH,0=off;1=on,,Status")
+    loaded = pickle.loads(pickle.dumps(msgdef))
+    assert loaded == msgdef
+    assert all(fielddef.parent is loaded for fielddef in loaded.children)
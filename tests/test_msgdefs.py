@@ -1,9 +1,10 @@
 """Test Message Definitions."""
+import copy
 import pathlib
 
 import pytest
 
-from pyebus import AUTO, FieldDef, MsgDef, MsgDefs
+from pyebus import AUTO, FieldDef, FrozenMsgDefs, MsgDef, MsgDefs
 from pyebus.msgdefdecoder import decode_msgdef
 from pyebus.types import HourMinuteType, IntType
 
@@ -24,7 +25,11 @@ def test_msgdefs0():
                 pass
 
     assert len(msgdefs) == 777
-    assert msgdefs.summary() == "777 messages (685 read, 19 update, 231 write) with 1653 fields"
+    assert msgdefs.summary() == "777 messages (692 read, 12 update, 231 write) with 1653 fields"
+    assert msgdefs.summary("hc") == "44 messages (42 read, 2 update, 18 write) with 125 fields"
+    assert msgdefs.counts("foo") == (0, 0, 0, 0, 0)
+    circuits = {msgdef.circuit for msgdef in msgdefs}
+    assert sum(msgdefs.counts(circuit).messages for circuit in circuits) == 777
 
     assert msgdefs.get("bai", "foo") is None
     assert msgdefs.get("bar", "foo") is None
@@ -32,6 +37,18 @@ def test_msgdefs0():
         "cc", "StatPowerOn", (FieldDef(0, "", IntType(0, 65534)),), read=True
     )
     assert msgdefs.get_ident("cc/StatPowerOff") is None
+    assert msgdefs.get_ident("cc/StatPowerOn#3") == msgdefs.get("cc", "StatPowerOn")
+    assert msgdefs.get_field_ident("ui/OutsideTemp/temp") == FieldDef(
+        0, "temp", IntType(-2047.9, 2047.9, divider=16), unit="°C", comment="Außentemperatur"
+    )
+    assert msgdefs.get_field_ident("ui/OutsideTemp/temp").msgdef is msgdefs.get("ui", "OutsideTemp")
+    assert msgdefs.get_field("ui", "OutsideTemp", "temp") is msgdefs.get_field_ident("ui/OutsideTemp/temp")
+    assert msgdefs.get_field_ident("ui/OutsideTemp/foo") is None
+    assert msgdefs.get_field_ident("ui/OutsideTemp#3/temp") is msgdefs.get_field_ident("ui/OutsideTemp/temp")
+    with pytest.raises(ValueError):
+        msgdefs.get_ident("cc")
+    with pytest.raises(ValueError):
+        msgdefs.get_field_ident("ui/OutsideTemp")
 
     assert len(msgdefs.find("?c")) == 132
     assert list(msgdefs.find("cc", "StatPowerOn")) == [
@@ -204,7 +221,7 @@ def test_msgdefs1():
                 pass
 
     assert len(msgdefs) == 413
-    assert msgdefs.summary() == "413 messages (396 read, 12 update, 229 write) with 830 fields"
+    assert msgdefs.summary() == "413 messages (398 read, 10 update, 229 write) with 830 fields"
 
 
 def test_msgdef_add_sub():
@@ -268,3 +285,177 @@ def test_msgdef_set_defaultprio():
         MsgDef("hc", "readwrite", (FieldDef(0, "temp1", IntType(0, 100)),), read=True, write=True, setprio=2),
     ]
     assert list(msgdef.setprio for msgdef in msgdefs) == [1, 3, None, None, 2]
+
+
+def test_msgdefs_find():
+    """Find is case-insensitive and keeps insertion order."""
+    msgdefs = MsgDefs()
+    msgdefs.add(MsgDef("mc", "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    msgdefs.add(MsgDef("hc", "TempMax", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    msgdefs.add(MsgDef("mc", "Status", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    msgdefs.add(MsgDef("MC.3", "temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+
+    assert [msgdef.ident for msgdef in msgdefs.find("MC", "TEMP")] == ["mc/Temp"]
+    assert [msgdef.ident for msgdef in msgdefs.find("mc*", "temp")] == ["mc/Temp", "MC.3/temp"]
+    assert [msgdef.ident for msgdef in msgdefs.find("*", "te*")] == ["mc/Temp", "hc/TempMax", "MC.3/temp"]
+    assert [msgdef.ident for msgdef in msgdefs.find("?c")] == ["mc/Temp", "mc/Status", "hc/TempMax"]
+    assert not list(msgdefs.find("bai"))
+
+    # re-added keys are ordered last
+    msgdefs = MsgDefs()
+    for circuit in ("z", "b", "c"):
+        msgdefs.add(MsgDef(circuit, "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    msgdefs.discard(msgdefs.get("z", "Temp"))
+    msgdefs.add(MsgDef("a", "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    idents = ["b/Temp", "c/Temp", "a/Temp"]
+    assert [msgdef.ident for msgdef in msgdefs] == idents
+    assert [msgdef.ident for msgdef in msgdefs.find("*")] == idents
+    assert [msgdef.ident for msgdef in msgdefs.resolve("*/*")] == idents
+
+
+def test_msgdefs_resolve_cache():
+    """Resolve results are cached until modification."""
+    msgdefs = MsgDefs()
+    msgdefs.add(MsgDef("mc", "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True))
+    generation = msgdefs.generation
+
+    resolved0 = msgdefs.resolve("mc/*")
+    resolved1 = msgdefs.resolve(["mc/*"])
+    assert resolved0 is not resolved1
+    assert (
+        list(resolved0)
+        == list(resolved1)
+        == [MsgDef("mc", "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True)]
+    )
+    assert not list(msgdefs.resolve("mc/*", filter_=lambda msgdef: msgdef.write))
+    assert msgdefs.generation == generation
+
+    msgdefs.add(MsgDef("mc", "Status", (FieldDef(0, "temp", IntType(0, 100)),), write=True))
+    assert msgdefs.generation > generation
+    assert [msgdef.ident for msgdef in msgdefs.resolve("mc/*")] == ["mc/Temp", "mc/Status"]
+    assert [msgdef.ident for msgdef in msgdefs.resolve("mc/*", filter_=lambda msgdef: msgdef.write)] == ["mc/Status"]
+
+    msgdefs.set_defaultprio(AUTO)
+    assert list(msgdefs.resolve("mc/Temp")) == [
+        MsgDef("mc", "Temp", (FieldDef(0, "temp", IntType(0, 100)),), read=True, setprio=1)
+    ]
+
+    msgdefs.clear()
+    assert not list(msgdefs.resolve("mc/*"))
+
+
+def test_msgdefs_set_algebra():
+    """Set Operations."""
+    md0 = MsgDef("hc", "FlowTempDesired", (FieldDef(0, "temp1", IntType(0, 100, divider=2), unit="°C"),), read=True)
+    md1 = MsgDef("hc", "FlowTempMax", (FieldDef(0, "temp0", IntType(0, 254), unit="°C"),), read=True, write=True)
+    md2 = MsgDef("mc", "FlowTempMin", (FieldDef(0, "temp0", IntType(0, 254), unit="°C"),), read=True, write=True)
+    msgdefs0 = MsgDefs()
+    for msgdef in (md0, md1, md2):
+        msgdefs0.add(msgdef)
+    msgdefs1 = MsgDefs()
+    for msgdef in (md1, md2):
+        msgdefs1.add(msgdef)
+
+    assert md0 in msgdefs0
+    assert md0 not in msgdefs1
+    assert list(msgdefs0 & msgdefs1) == [md1, md2]
+    assert list(msgdefs1 | msgdefs0) == [md1, md0, md2]
+    assert msgdefs1.issubset(msgdefs0)
+    assert not msgdefs0.issubset(msgdefs1)
+
+    assert msgdefs0.get_field_ident("mc/FlowTempMin/temp0") is not None
+    msgdefs0.difference_update(msgdefs1)
+    assert list(msgdefs0) == [md0]
+    assert msgdefs0.get_ident("mc/FlowTempMin") is None
+    assert msgdefs0.get_field_ident("mc/FlowTempMin/temp0") is None
+    assert msgdefs0.summary() == "1 messages (1 read, 0 update, 0 write) with 1 fields"
+    assert msgdefs0.counts("mc") == (0, 0, 0, 0, 0)
+    assert not list(msgdefs0.find("mc"))
+    assert not list(msgdefs0.find("*", "FlowTempM*"))
+
+    msgdefs0.discard(md0)
+    msgdefs0.discard(md0)
+    assert not list(msgdefs0)
+    assert len(msgdefs0) == 0
+    msgdefs0.add(md2)
+    assert list(msgdefs0.find("m*")) == [md2]
+
+
+def test_msgdefs_frozen():
+    """Frozen Message Definitions."""
+    md0 = MsgDef("hc", "FlowTempDesired", (FieldDef(0, "temp1", IntType(0, 100, divider=2), unit="°C"),), read=True)
+    md1 = MsgDef("hc", "FlowTempMax", (FieldDef(0, "temp0", IntType(0, 254), unit="°C"),), read=True, write=True)
+    md2 = MsgDef("mc", "FlowTempMin", (FieldDef(0, "temp0", IntType(0, 254), unit="°C"),), read=True, write=True)
+    msgdefs = MsgDefs()
+    msgdefs.add(md0)
+    msgdefs.add(md1)
+
+    frozen = msgdefs.freeze()
+    assert frozen.freeze() is frozen
+    assert copy.copy(frozen) is frozen
+    assert frozen == msgdefs
+    assert hash(frozen) == hash(FrozenMsgDefs([md1, md0]))
+    assert {frozen: 1}[FrozenMsgDefs([md0, md1])] == 1
+    for func, args in (
+        (frozen.add, (md2,)),
+        (frozen.discard, (md0,)),
+        (frozen.clear, ()),
+        (frozen.set_defaultprio, (AUTO,)),
+        (frozen.difference_update, (msgdefs,)),
+        (frozen.sort, ()),
+        (frozen.assign, (msgdefs,)),
+    ):
+        with pytest.raises(TypeError):
+            func(*args)
+
+    # origin is copy-on-write
+    msgdefs.add(md2)
+    msgdefs.discard(md0)
+    assert list(msgdefs) == [md1, md2]
+    assert list(frozen) == [md0, md1]
+    assert frozen.summary() == "2 messages (2 read, 0 update, 1 write) with 2 fields"
+    assert list(frozen.find("h*", "*max")) == [md1]
+    assert not list(frozen.find("mc"))
+
+    # builder
+    builder = frozen.thaw()
+    assert isinstance(builder, MsgDefs) and not isinstance(builder, FrozenMsgDefs)
+    builder.set_defaultprio(AUTO)
+    assert [msgdef.setprio for msgdef in builder] == [1, 2]
+    assert [msgdef.setprio for msgdef in frozen] == [None, None]
+
+    # operations
+    assert isinstance(frozen - msgdefs, FrozenMsgDefs)
+    assert list(frozen - msgdefs) == [md0]
+    assert list(frozen & msgdefs) == [md1]
+    assert isinstance(msgdefs | frozen, MsgDefs)
+    assert list(msgdefs | frozen) == [md1, md0, md2]
+
+
+def test_msgdefs_sort_assign():
+    """Sort and Assign."""
+    msgdefs = MsgDefs()
+    for line in (TESTDATAPATH / "find0.txt").read_text().splitlines():
+        try:
+            msgdefs.add(decode_msgdef(line))
+        except ValueError:
+            pass
+    refmsgdefs = MsgDefs()
+    for msgdef in sorted(msgdefs, key=lambda msgdef: (msgdef.circuit, msgdef.name)):
+        refmsgdefs.add(msgdef)
+    assert list(msgdefs) != list(refmsgdefs)
+
+    msgdefs.sort()
+    assert list(msgdefs) == list(refmsgdefs)
+    assert list(msgdefs.find("*c*", "*Temp*")) == list(refmsgdefs.find("*c*", "*Temp*"))
+
+    other = MsgDefs()
+    generation = other.generation
+    other.assign(msgdefs)
+    assert other.generation > generation
+    assert list(other) == list(msgdefs)
+    assert other.get_ident("ui/OutsideTemp") is msgdefs.get_ident("ui/OutsideTemp")
+
+    # copy-on-write
+    other.discard(other.get_ident("ui/OutsideTemp"))
+    assert len(other) == len(msgdefs) - 1
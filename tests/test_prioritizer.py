@@ -1,4 +1,6 @@
 """Test Prioritizer."""
+import json
+import time
 from datetime import timedelta
 from time import sleep
 
@@ -133,3 +135,87 @@ def test_unknown():
     p = Prioritizer(msgdefs, (0.01, 0.03), intervals=1)
     with pytest.raises(UnknownMsgError):
         p.notify(m)
+    # known after adding, unknown again after removal
+    msgdefs.add(md)
+    p.notify(m)
+    assert p.get_prio(md) == 5
+    msgdefs.discard(md)
+    with pytest.raises(UnknownMsgError):
+        p.notify(m)
+
+
+def test_state(tmp_path, monkeypatch):
+    """Save And Load State."""
+    # pylint: disable=protected-access
+    statefile = tmp_path / "prio.json"
+    p, md, m0, m1 = _init()
+    msgdefs = MsgDefs()
+    msgdefs.add(md)
+    p.set_prio(md, 3)
+    for m in [m0, m1]:
+        _step(p, md, m, 0.005, 3)
+    for m in [m0, m1]:
+        _step(p, md, m, 0.005, 2)
+    with pytest.raises(ValueError, match="no statefile"):
+        p.save()
+    with pytest.raises(ValueError, match="no statefile"):
+        p.load()
+    p.save(statefile)
+    assert [path.name for path in tmp_path.iterdir()] == ["prio.json"]
+
+    # restart one hour later: timestamps are one hour older
+    walltime = time.time()
+    monkeypatch.setattr(time, "time", lambda: walltime + 3600)
+    p2 = Prioritizer(msgdefs, (0.01, 0.03), intervals=1, statefile=statefile)
+    monkeypatch.undo()
+    assert p2.get_prio(md) == 2
+    assert p2._timestamps[0] == pytest.approx(time.monotonic() - 3600, abs=1)
+
+    # last values are known after restart: the same values are constant, others are a change
+    p3 = Prioritizer(msgdefs, (10, 30), intervals=1, statefile=statefile)
+    timestamp = p3._timestamps[0]
+    p3.notify(m1)
+    assert p3._timestamps[0] == timestamp
+    p4 = Prioritizer(msgdefs, (10, 30), intervals=1, statefile=statefile)
+    p4.notify(m0)
+    assert p4._timestamps[0] > timestamp
+
+
+def test_state_autosave(tmp_path, caplog):
+    """Periodic Save."""
+    statefile = tmp_path / "prio.json"
+    statefile.write_text("broken")
+    _, md, m0, _ = _init()
+    msgdefs = MsgDefs()
+    msgdefs.add(md)
+    p = Prioritizer(msgdefs, (0.01, 0.03), statefile=statefile, saveinterval=0.01)
+    assert "Cannot load prioritizer state" in caplog.text
+    assert p.get_prio(md) == 1
+    p.notify(m0)
+    assert statefile.read_text() == "broken"
+    sleep(0.02)
+    p.notify(m0)
+    assert list(json.loads(statefile.read_text())["messages"]) == ["circuit/name"]
+
+    statefile.write_text('{"version":1,"messages":{"circuit/name":[9,null,null,0,0]}}')
+    p.load()
+    assert p.get_prio(md) == 3
+    statefile.write_text('{"version":1,"messages":{"circuit/name":[9]}}')
+    with pytest.raises(ValueError):
+        p.load()
+    statefile.write_text('{"version":1,"messages":[]}')
+    with pytest.raises(ValueError):
+        p.load()
+    statefile.write_text('{"version":1,"messages":{"circuit/name":[-5,null,null,0,0]}}')
+    with pytest.raises(ValueError, match="Invalid prioritizer state"):
+        p.load()
+
+    # partially valid files are not loaded at all
+    statefile.write_text('{"version":1,"messages":{"circuit/name":[2,null,null,0,0],"other/name":[2,null,null,-1,0]}}')
+    caplog.clear()
+    p2 = Prioritizer(msgdefs, (0.01, 0.03), statefile=statefile)
+    assert "Cannot load prioritizer state" in caplog.text
+    assert p2.get_prio(md) == 1
+    with pytest.raises(ValueError):
+        p.load()
+    assert p.get_prio(md) == 3
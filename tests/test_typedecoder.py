@@ -0,0 +1,38 @@
+"""Test Type Decoder."""
+import concurrent.futures
+
+import pytest
+
+from pyebus import types
+from pyebus.typedecoder import TYPEMAP, decode_type
+
+
+def test_shared():
+    """Equal types are one instance."""
+    assert decode_type("BDA") is decode_type("HDA")
+    assert decode_type("UIN") is decode_type("UIR")
+    assert decode_type("BI0") is decode_type("BI3:2")
+    assert decode_type("D2C", 2) is decode_type("D2C", 2.0) is not decode_type("D2C")
+    assert decode_type("SIN", 10) is decode_type("SIN", 10.0)
+    assert decode_type("SIN", 10) == types.IntType(-3276.7, 3276.7, divider=10)
+    assert decode_type("UIN", 2) is decode_type("UIR", 2) is not decode_type("SIN", 2)
+
+
+def test_typemap():
+    """TYPEMAP is not modified."""
+    typemap = dict(TYPEMAP)
+    assert decode_type("STR:12") == types.StrType(12)
+    assert decode_type("HEX:3") == types.HexType(3)
+    assert decode_type("BI7:1") == types.BoolType()
+    assert TYPEMAP == typemap
+    with pytest.raises(KeyError):
+        decode_type("FOO")
+
+
+def test_threads():
+    """Concurrent decoding returns the same instances."""
+    typecodes = [f"{prefix}:{length}" for prefix in ("STR", "NTS", "HEX") for length in range(100, 200)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: [decode_type(typecode) for typecode in typecodes], range(8)))
+    for result in results[1:]:
+        assert all(type0 is type1 for type0, type1 in zip(results[0], result))
@@ -0,0 +1,171 @@
+"""Test Types."""
+import datetime
+
+import pytest
+
+from pyebus import types
+
+
+def _strptime_date(value):
+    return datetime.datetime.strptime(value, "%d.%m.%Y").date()
+
+
+def _strptime_time(value):
+    tstamp = datetime.datetime.strptime(value, "%H:%M:%S")
+    return types.Time(tstamp.hour, tstamp.minute, tstamp.second)
+
+
+def _strptime_hourminute(value):
+    tstamp = datetime.datetime.strptime(value, "%H:%M")
+    return types.HourMinute(tstamp.hour, tstamp.minute)
+
+
+def _strptime_datetime(value):
+    return types.DateTime.strptime(value, "%d.%m.%Y %H:%M:%S")
+
+
+def _check_same(decode, ref, value):
+    """`decode` returns the same result or raises the same error as `ref`."""
+    try:
+        expected = ref(value)
+    except ValueError as exc:
+        with pytest.raises(ValueError) as excinfo:
+            decode(value)
+        assert str(excinfo.value) == str(exc), value
+    else:
+        decoded = decode(value)
+        assert decoded == expected, value
+        assert type(decoded) is type(expected), value
+
+
+def test_date_fastpath():
+    """Date decoding without strptime behaves like strptime."""
+    for value in (
+        "1.2.2020",
+        "01.02.2020",
+        "31.12.1999",
+        "29.2.2020",
+        " 1.2.2020",
+        "1.2.2020 ",
+        "1. 2.2020",
+        "32.1.2020",
+        "29.2.2021",
+        "1.13.2020",
+        "0.1.2020",
+        "1.0.2020",
+        "1.2.20",
+        "1.2.02020",
+        "001.2.2020",
+        "+1.2.2020",
+        "1..2020",
+        "١.٢.٢٠٢٠",
+    ):
+        _check_same(types.DateType().decode, _strptime_date, value)
+
+
+def test_time_fastpath():
+    """Time decoding without strptime behaves like strptime."""
+    for value in (
+        "1:2:3",
+        "01:02:03",
+        "23:59:59",
+        " 1:2:3",
+        "1:2:3 ",
+        "24:00:00",
+        "23:60:00",
+        "23:59:60",
+        "1:2",
+        "1:2:3:4",
+        "-1:2:3",
+        "001:2:3",
+    ):
+        _check_same(types.TimeType().decode, _strptime_time, value)
+
+
+def test_hourminute_fastpath():
+    """Hour-Minute decoding without strptime behaves like strptime."""
+    for value in ("7:5", "07:05", "23:59", " 7:5", "7:5 ", "24:00", "23:60", "7", "7:5:0", "-7:5"):
+        _check_same(types.HourMinuteType().decode, _strptime_hourminute, value)
+
+
+def test_datetime_fastpath():
+    """Date-Time decoding without strptime behaves like strptime."""
+    for value in (
+        "1.2.2020 1:2:3",
+        "01.02.2020 01:02:03",
+        "1.2.2020  1:2:3",
+        " 1.2.2020 1:2:3",
+        "31.2.2020 1:2:3",
+        "1.2.2020 25:00:00",
+        "1.2.2020",
+        "1.2.2020 1:2",
+    ):
+        _check_same(types.DateTimeType().decode, _strptime_datetime, value)
+
+
+def test_bool():
+    """Boolean decoding and encoding via lookup tables."""
+
+    def decode(value):
+        if value not in ("-", ""):
+            return bool(int(value))
+        return None
+
+    def encode(value):
+        if value is None:
+            return "-"
+        valuestr = str(value).lower()
+        if valuestr in ("1", "true"):
+            return 1
+        if valuestr in ("0", "false"):
+            return 0
+        raise ValueError(f"{value} is not a valid boolean")
+
+    type_ = types.BoolType()
+    for value in ("0", "1", "-", "", "2", "01", "x"):
+        _check_same(type_.decode, decode, value)
+    for value in (0, 1, "0", "1", "false", "TRUE", False, True, None, 2, "blub"):
+        _check_same(type_.encode, encode, value)
+
+
+def test_enum():
+    """Enumeration decoding and encoding via lookup tables."""
+    type_ = types.EnumType(("on", "10", "off"))
+    assert type_.decode("on") == "on"
+    assert type_.decode("10") == 10
+    assert type_.decode("7") == 7
+    assert type_.decode("-") is None
+    assert type_.encode("off") == "off"
+    assert type_.encode("10") == "10"
+    assert type_.encode(7) == "7"
+    assert type_.encode(None) == "-"
+    for value in ("auto", "On", ""):
+        with pytest.raises(ValueError, match="^Unknown value '.*'. Allowed values are on, 10, off.$"):
+            type_.decode(value)
+        with pytest.raises(ValueError, match="^Unknown value '.*'. Allowed values are on, 10, off.$"):
+            type_.encode(value)
+
+
+def test_hourminute_cache(monkeypatch):
+    """Cached Hour-Minute results keep the minute resolution check."""
+    # pylint: disable=protected-access
+    type_ = types.HourMinuteType(minres=10)
+    plain = types.HourMinuteType()
+    assert plain.decode("23:51") == types.HourMinute(23, 51)
+    for _ in range(2):
+        assert type_.decode("23:50") == types.HourMinute(23, 50)
+        with pytest.raises(ValueError, match="^Minute of 23:51 must be multiple of 10$"):
+            type_.decode("23:51")
+    assert "23:51" not in type_._cache
+
+    # inputs beyond the cache size are decoded, but not cached
+    monkeypatch.setattr(types.HourMinuteType, "CACHESIZE", 2)
+    type_ = types.HourMinuteType()
+    for _ in range(2):
+        assert [type_.decode(value) for value in ("1:00", "2:00", "3:00", "-:-")] == [
+            types.HourMinute(1, 0),
+            types.HourMinute(2, 0),
+            types.HourMinute(3, 0),
+            None,
+        ]
+    assert list(type_._cache) == ["1:00", "2:00"]